@@ -0,0 +1,52 @@
+"""Compare the memory footprint of player stats representations.
+
+Run from the repository root:
+
+    python -m benchmarks.player_stats_memory
+"""
+import random
+import tracemalloc
+from bot.player_stats import PlayerStats
+
+SIZES = (10_000, 100_000, 1_000_000)
+
+def _user_ids(count):
+    # Discord snowflakes are ~60-bit integers. Built inside each traced
+    # builder so the key objects are counted for both layouts.
+    rng = random.Random(count)
+    return (rng.getrandbits(60) for _ in range(count))
+
+def build_dict_records(count):
+    """The previous layout: str user id -> dict with three counters"""
+    return {
+        str(user_id): {"games_played": index % 50, "wins": index % 20, "losses": index % 30}
+        for index, user_id in enumerate(_user_ids(count))
+    }
+
+def build_slotted_records(count):
+    """The current layout: int user id -> PlayerStats"""
+    return {
+        user_id: PlayerStats(index % 50, index % 20, index % 30)
+        for index, user_id in enumerate(_user_ids(count))
+    }
+
+def measure(builder, count):
+    tracemalloc.start()
+    records = builder(count)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return size
+
+def main():
+    print(f"{'players':>10} {'dict records':>14} {'PlayerStats':>14} {'saving':>8}")
+    for count in SIZES:
+        dict_size = measure(build_dict_records, count)
+        slotted_size = measure(build_slotted_records, count)
+        saving = 1 - slotted_size / dict_size
+        print(
+            f"{count:>10,} {dict_size / 2**20:>11.1f} MB {slotted_size / 2**20:>11.1f} MB {saving:>7.0%}"
+        )
+
+if __name__ == "__main__":
+    main()
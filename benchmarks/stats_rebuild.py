@@ -0,0 +1,91 @@
+"""Time the streaming stats rebuild over a synthetic one million game log.
+
+The games are written as compressed archive segments in a temporary
+directory, then streamed back through GameArchive exactly as the
+consistency check reads them. Run from the repository root:
+
+    python -m benchmarks.stats_rebuild [game count]
+"""
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from bot.consistency import check_consistency
+from bot.game_archive import GameArchive
+from bot.player_stats import PlayerStats
+
+GAMES = 1_000_000
+PLAYERS = 50_000
+SEGMENT_SIZE = 1000
+# Share of games left "started" without a result
+UNFINISHED_RATE = 0.002
+
+def synthetic_games(count, players, seed=0):
+    """Yield game log entries oldest first, with 1v1 to 5v5 teams"""
+    rng = random.Random(seed)
+    user_ids = [rng.getrandbits(60) for _ in range(players)]
+    start = datetime(2024, 1, 1)
+    for game_number in range(1, count + 1):
+        size = rng.randint(1, 5)
+        picked = rng.sample(user_ids, 2 * size)
+        timestamp = (start + timedelta(minutes=game_number)).isoformat()
+        unfinished = rng.random() < UNFINISHED_RATE
+        yield {
+            "game_number": game_number,
+            "timestamp": timestamp,
+            "status": "started" if unfinished else "completed",
+            "team1": [{"id": user_id, "name": f"Player {user_id % 10000}"} for user_id in picked[:size]],
+            "team2": [{"id": user_id, "name": f"Player {user_id % 10000}"} for user_id in picked[size:]],
+            "winner": None if unfinished else rng.choice((1, 2)),
+            "end_timestamp": None if unfinished else timestamp
+        }
+
+def write_archive(directory, count):
+    archive = GameArchive(directory, SEGMENT_SIZE, recent_games=0)
+    segment = []
+    for game in synthetic_games(count, PLAYERS):
+        segment.append(game)
+        if len(segment) == SEGMENT_SIZE:
+            archive.segments.append(archive.write_segment(segment))
+            segment = []
+    if segment:
+        archive.segments.append(archive.write_segment(segment))
+    return archive
+
+def live_stats(archive):
+    """Build live stats that have drifted from the log for a few players"""
+    report = check_consistency(archive.iter_games(), {})
+    player_stats = dict(report.rebuilt)
+    for user_id in list(player_stats)[:100]:
+        stats = player_stats[user_id]
+        player_stats[user_id] = PlayerStats(stats.games_played + 1, stats.wins + 1, stats.losses)
+    return player_stats
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else GAMES
+    with tempfile.TemporaryDirectory() as directory:
+        started = time.perf_counter()
+        archive = write_archive(directory, count)
+        print(f"wrote {count:,} games in {len(archive.segments)} segments: {time.perf_counter() - started:.1f}s")
+
+        player_stats = live_stats(archive)
+
+        started = time.perf_counter()
+        report = check_consistency(archive.iter_games(), player_stats)
+        elapsed = time.perf_counter() - started
+        print(
+            f"rebuilt {len(report.rebuilt):,} players from {report.games_scanned:,} games: {elapsed:.1f}s "
+            f"({report.games_scanned / elapsed:,.0f} games/s)"
+        )
+        print(f"found {len(report.mismatches)} mismatched players, {len(report.unfinished_numbers)} unfinished games")
+
+        tracemalloc.start()
+        check_consistency(archive.iter_games(), player_stats)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"peak memory while streaming: {peak / 2**20:.1f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -21,8 +21,8 @@ class AdminManager:
             return False
         return any(role.id == Config.HOST_ROLE_ID for role in member.roles)
     
-    async def send_admin_panel(self, channel):
-        """Send the admin panel menu"""
+    def build_admin_panel(self):
+        """Build the admin panel embed and view"""
         embed = discord.Embed(
             title="🛠️ Admin Panel",
             description="Management tools for bot administration",
@@ -41,9 +41,20 @@ class AdminManager:
             inline=False
         )
         
+        embed.add_field(
+            name="🩺 Stats Maintenance",
+            value="Check player stats against the game log, repair drift and rebuild ratings",
+            inline=False
+        )
+        
         embed.set_footer(text="Management role required")
         
         view = AdminPanelView()
+        return embed, view
+    
+    async def send_admin_panel(self, channel):
+        """Send the admin panel menu"""
+        embed, view = self.build_admin_panel()
         await channel.send(embed=embed, view=view)
     
     async def log_bot_action(self, user, action, details=None, guild=None):
@@ -171,7 +182,7 @@ class AdminPanelView(discord.ui.View):
         await interaction.client.admin_manager.log_bot_action(
             interaction.user, 
             "Refreshed leaderboard",
-            "Posted new leaderboard to public channel",
+            "Requested an update of the public leaderboard message",
             interaction.guild
         )
     
@@ -190,6 +201,110 @@ class AdminPanelView(discord.ui.View):
         
         modal = GameSearchModal()
         await interaction.response.send_modal(modal)
+    
+    @discord.ui.button(label="Rebuild Ratings", style=discord.ButtonStyle.danger, emoji="📈", custom_id="admin_rebuild_ratings", row=1)
+    async def rebuild_ratings(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if not interaction.client.admin_manager.has_management_role(interaction.user):
+            await interaction.response.send_message("❌ Management role required", ephemeral=True)
+            return
+        
+        await interaction.response.defer(ephemeral=True)
+        try:
+            games, changed, elapsed = await interaction.client.stats_manager.rebuild_ratings()
+            await interaction.followup.send(
+                f"✅ Replayed {games} games in {elapsed:.1f}s, {changed} ratings changed",
+                ephemeral=True
+            )
+            await interaction.client.admin_manager.log_bot_action(
+                interaction.user,
+                "Rebuilt ratings",
+                f"Replayed {games} games, {changed} ratings changed",
+                interaction.guild
+            )
+        except Exception as e:
+            logger.error(f"Error rebuilding ratings: {e}")
+            await interaction.followup.send("❌ Error rebuilding ratings", ephemeral=True)
+    
+    @discord.ui.button(label="Check Stats", style=discord.ButtonStyle.secondary, emoji="🩺", custom_id="admin_check_stats", row=1)
+    async def check_stats(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if not interaction.client.admin_manager.has_management_role(interaction.user):
+            await interaction.response.send_message("❌ Management role required", ephemeral=True)
+            return
+        
+        await interaction.response.defer(ephemeral=True)
+        try:
+            report = await interaction.client.stats_manager.check_consistency()
+            embed = build_consistency_embed(interaction.client, report)
+            view = None if report.is_consistent else StatsRepairView()
+            await interaction.followup.send(embed=embed, view=view, ephemeral=True)
+        except Exception as e:
+            logger.error(f"Error checking stats: {e}")
+            await interaction.followup.send("❌ Error checking stats", ephemeral=True)
+
+def build_consistency_embed(bot, report):
+    """Summarize a stats consistency report"""
+    embed = discord.Embed(
+        title="🩺 Stats Consistency Check",
+        description=(
+            f"Scanned {report.games_scanned} games: {report.completed_games} completed, "
+            f"{report.cancelled_games} cancelled, {len(report.unfinished_numbers)} never finished"
+        ),
+        color=discord.Color.green() if report.is_consistent else discord.Color.orange()
+    )
+    
+    if report.unfinished_numbers:
+        numbers = sorted(report.unfinished_numbers)
+        listed = ", ".join(f"#{number}" for number in numbers[:20])
+        if len(numbers) > 20:
+            listed += f" and {len(numbers) - 20} more"
+        embed.add_field(name="Unfinished Games", value=listed, inline=False)
+    
+    if report.mismatches:
+        lines = []
+        for user_id, expected, actual in report.mismatches[:10]:
+            user = bot.get_user(user_id)
+            name = user.display_name if user else f"User {user_id}"
+            lines.append(
+                f"**{name}** - stats {actual.wins}W/{actual.losses}L, "
+                f"log {expected.wins}W/{expected.losses}L"
+            )
+        if len(report.mismatches) > 10:
+            lines.append(f"...and {len(report.mismatches) - 10} more")
+        embed.add_field(name=f"Mismatched Players ({len(report.mismatches)})", value="\n".join(lines), inline=False)
+    
+    if report.is_consistent:
+        embed.add_field(name="Result", value="✅ Player stats match the game log", inline=False)
+    else:
+        embed.set_footer(text="Repair cancels unfinished games and resets totals to the game log")
+    return embed
+
+class StatsRepairView(discord.ui.View):
+    def __init__(self):
+        super().__init__(timeout=300)  # 5 minute timeout
+    
+    @discord.ui.button(label="Repair", style=discord.ButtonStyle.danger, emoji="🛠️")
+    async def repair(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if not interaction.client.admin_manager.has_management_role(interaction.user):
+            await interaction.response.send_message("❌ Management role required", ephemeral=True)
+            return
+        
+        await interaction.response.defer(ephemeral=True)
+        try:
+            report, repaired, cancelled = await interaction.client.stats_manager.repair_stats()
+            await interaction.followup.send(
+                f"✅ Repaired {repaired} players and cancelled {cancelled} unfinished games "
+                f"({report.games_scanned} games scanned)",
+                ephemeral=True
+            )
+            await interaction.client.admin_manager.log_bot_action(
+                interaction.user,
+                "Repaired stats",
+                f"{repaired} players reset to the game log, {cancelled} unfinished games cancelled",
+                interaction.guild
+            )
+        except Exception as e:
+            logger.error(f"Error repairing stats: {e}")
+            await interaction.followup.send("❌ Error repairing stats", ephemeral=True)
 
 class GameSearchModal(discord.ui.Modal, title="Game Search"):
     def __init__(self):
@@ -215,34 +330,13 @@ class GameSearchModal(discord.ui.Modal, title="Game Search"):
             search_query = self.search_term.value.strip().lower()
             result_limit = min(int(self.limit.value or 10), 50)
             
-            # Access game log data
-            game_log = interaction.client.stats_manager._load_game_log()
-            
-            if not game_log.get("games"):
-                await interaction.response.send_message("❌ No games found in log", ephemeral=True)
-                return
-            
-            matching_games = []
-            
-            if search_query == "all":
-                matching_games = list(game_log["games"].values())[-result_limit:]
-            else:
-                for game_id, game_data in game_log["games"].items():
-                    # Search in player names or game number
-                    if (search_query in str(game_data.get("game_number", "")).lower() or
-                        any(search_query in player.lower() for player in game_data.get("team1_names", [])) or
-                        any(search_query in player.lower() for player in game_data.get("team2_names", [])) or
-                        search_query in game_data.get("winner", "").lower()):
-                        matching_games.append(game_data)
+            # Search resident games first, loading archive segments only as needed
+            matching_games = interaction.client.stats_manager.search_games(search_query, result_limit)
             
             if not matching_games:
                 await interaction.response.send_message(f"❌ No games found matching '{search_query}'", ephemeral=True)
                 return
             
-            # Sort by game number (most recent first)
-            matching_games.sort(key=lambda x: x.get("game_number", 0), reverse=True)
-            matching_games = matching_games[:result_limit]
-            
             embed = discord.Embed(
                 title=f"🔍 Game Search Results",
                 description=f"Found {len(matching_games)} games matching '{search_query}'",
@@ -251,9 +345,9 @@ class GameSearchModal(discord.ui.Modal, title="Game Search"):
             
             for game in matching_games[:10]:  # Limit embed fields
                 game_num = game.get("game_number", "Unknown")
-                team1 = ", ".join(game.get("team1_names", []))
-                team2 = ", ".join(game.get("team2_names", []))
-                winner = game.get("winner", "Unknown")
+                team1 = ", ".join(player["name"] for player in game.get("team1", []))
+                team2 = ", ".join(player["name"] for player in game.get("team2", []))
+                winner = f"Team {game['winner']}" if game.get("winner") else game.get("status", "Unknown").title()
                 timestamp = game.get("timestamp", "Unknown")
                 
                 field_value = f"**Teams:** {team1} vs {team2}\n**Winner:** {winner}\n**Time:** {timestamp}"
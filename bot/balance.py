@@ -0,0 +1,393 @@
+import heapq
+import random
+import time
+from bisect import bisect_left
+
+# Largest lobby split by exact search; bigger lobbies use the greedy heuristic
+EXACT_LIMIT = 24
+# Largest lobby searched exactly when constraints apply (the search can't use
+# meet-in-the-middle because teammate penalties don't add up per half)
+CONSTRAINED_EXACT_LIMIT = 16
+
+class Partition:
+    """One way to split a lobby into two equal teams"""
+
+    __slots__ = ("team1", "team2", "difference", "penalty")
+
+    def __init__(self, team1, team2, difference, penalty=0.0):
+        self.team1 = team1  # Player indices
+        self.team2 = team2
+        self.difference = difference  # Absolute difference of team rating totals
+        self.penalty = penalty  # Sum of penalties for pairs placed on the same team
+
+    @property
+    def cost(self):
+        return self.difference + self.penalty
+
+    def __repr__(self):
+        return (
+            f"Partition(team1={self.team1}, team2={self.team2}, "
+            f"difference={self.difference:.1f}, penalty={self.penalty:.1f})"
+        )
+
+def best_partitions(ratings, limit=1, together=(), apart=(), penalties=None):
+    """Return up to `limit` even splits of `ratings`, best first.
+
+    Teams are always the same size, so balancing the rating totals also
+    balances the team averages. Lobbies up to EXACT_LIMIT players are
+    searched exactly; larger ones fall back to a greedy split.
+
+    Optional constraints use player indices: `together` is a list of groups
+    that must share a team, `apart` a list of pairs that must not, and
+    `penalties` maps (i, j) pairs to a cost in rating points added when both
+    end up on the same team. Raises ValueError if the hard constraints can't
+    be met.
+    """
+    count = len(ratings)
+    if count < 2 or count % 2:
+        raise ValueError("Teams need an even number of players")
+    if together or apart or penalties:
+        return _constrained_partitions(ratings, limit, together, apart, penalties or {})
+    if count > EXACT_LIMIT:
+        return [_greedy_partition(ratings)]
+    return _meet_in_the_middle(ratings, limit)
+
+def _subset_sums(ratings, first_index):
+    """(size, total, mask) for every subset of a slice of players"""
+    subsets = [(0, 0.0, 0)]
+    for offset, rating in enumerate(ratings):
+        bit = 1 << (first_index + offset)
+        subsets += [(size + 1, total + rating, mask | bit) for size, total, mask in subsets]
+    return subsets
+
+def _meet_in_the_middle(ratings, limit):
+    """Exact search: pair subsets of each half of the lobby by rating total.
+
+    Player 0 is pinned to team 1 so mirrored splits are only counted once.
+    For each left subset only the `limit` right subsets closest to the
+    target total can make the overall top `limit`, so those are found by
+    binary search instead of scanning every pairing.
+    """
+    count = len(ratings)
+    team_size = count // 2
+    half = count // 2
+    grand_total = sum(ratings)
+    target = grand_total / 2
+
+    # Right-half subsets grouped by size and sorted by total
+    right_by_size = {}
+    for size, total, mask in _subset_sums(ratings[half:], half):
+        right_by_size.setdefault(size, []).append((total, mask))
+    right_totals = {}
+    for size, subsets in right_by_size.items():
+        subsets.sort()
+        right_totals[size] = [total for total, _ in subsets]
+
+    best = []  # Max-heap by difference via negation: (-difference, -mask, mask)
+    for size, total, mask in _subset_sums(ratings[:half], 0):
+        if not mask & 1:
+            continue
+        needed = team_size - size
+        subsets = right_by_size.get(needed)
+        if subsets is None:
+            continue
+
+        totals = right_totals[needed]
+        position = bisect_left(totals, target - total)
+        low, high = position - 1, position
+        # Walk outwards from the target, nearest totals first
+        for _ in range(limit):
+            if low < 0 and high >= len(totals):
+                break
+            if high >= len(totals) or (low >= 0 and target - total - totals[low] <= totals[high] - (target - total)):
+                right_total, right_mask = subsets[low]
+                low -= 1
+            else:
+                right_total, right_mask = subsets[high]
+                high += 1
+
+            difference = abs(grand_total - 2 * (total + right_total))
+            if len(best) < limit:
+                heapq.heappush(best, (-difference, -(mask | right_mask), mask | right_mask))
+            elif difference < -best[0][0]:
+                heapq.heapreplace(best, (-difference, -(mask | right_mask), mask | right_mask))
+            else:
+                # Further candidates for this subset are only less balanced
+                break
+
+    results = []
+    for negative_difference, _, team_mask in sorted(best, reverse=True):
+        team1 = [index for index in range(count) if team_mask >> index & 1]
+        team2 = [index for index in range(count) if not team_mask >> index & 1]
+        results.append(Partition(team1, team2, -negative_difference))
+    return results
+
+def _greedy_partition(ratings):
+    """Largest-first greedy split, then improve with pairwise swaps"""
+    team_size = len(ratings) // 2
+    team1, team2 = [], []
+    total1 = total2 = 0.0
+    for index in sorted(range(len(ratings)), key=lambda index: -ratings[index]):
+        if len(team2) >= team_size or (len(team1) < team_size and total1 <= total2):
+            team1.append(index)
+            total1 += ratings[index]
+        else:
+            team2.append(index)
+            total2 += ratings[index]
+
+    # Swap the pair that most reduces the gap until no swap helps
+    improved = True
+    while improved:
+        improved = False
+        gap = total1 - total2
+        best_swap, best_gap = None, abs(gap)
+        for i, a in enumerate(team1):
+            for j, b in enumerate(team2):
+                new_gap = abs(gap - 2 * (ratings[a] - ratings[b]))
+                if new_gap < best_gap - 1e-9:
+                    best_swap, best_gap = (i, j), new_gap
+        if best_swap is not None:
+            i, j = best_swap
+            a, b = team1[i], team2[j]
+            team1[i], team2[j] = b, a
+            total1 += ratings[b] - ratings[a]
+            total2 += ratings[a] - ratings[b]
+            improved = True
+
+    return Partition(sorted(team1), sorted(team2), abs(total1 - total2))
+
+def _merge_groups(count, together):
+    """Union players that must share a team into units, returns unit per player"""
+    parent = list(range(count))
+
+    def find(index):
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    for group in together:
+        group = list(group)
+        for index in group[1:]:
+            parent[find(index)] = find(group[0])
+    return [find(index) for index in range(count)]
+
+def _constrained_partitions(ratings, limit, together, apart, penalties):
+    """Search unit-by-unit assignments under hard and soft constraints.
+
+    Players that must play together are merged into units, so a 10 player
+    lobby has at most 2^9 assignments. Branches are cut when they break a
+    constraint or can no longer beat the current `limit`-th best cost.
+    """
+    count = len(ratings)
+    team_size = count // 2
+
+    # Strongest units first so the rating bound prunes early
+    unit_of = _merge_groups(count, together)
+    root_totals = {}
+    for index, root in enumerate(unit_of):
+        root_totals[root] = root_totals.get(root, 0.0) + ratings[index]
+    roots = sorted(root_totals, key=lambda root: -root_totals[root])
+    unit_index = {root: position for position, root in enumerate(roots)}
+    members = [[] for _ in roots]
+    for index in range(count):
+        members[unit_index[unit_of[index]]].append(index)
+    unit_sizes = [len(unit) for unit in members]
+    unit_totals = [root_totals[root] for root in roots]
+
+    if max(unit_sizes) > team_size:
+        raise ValueError("A group that must play together is larger than a team")
+
+    apart_units = [set() for _ in roots]
+    for first, second in apart:
+        first, second = unit_index[unit_of[first]], unit_index[unit_of[second]]
+        if first == second:
+            raise ValueError("Players that must be apart are also required to play together")
+        apart_units[first].add(second)
+        apart_units[second].add(first)
+
+    # Penalty between units: pairs inside one unit always share a team
+    unit_penalty = {}
+    fixed_penalty = 0.0
+    for (first, second), cost in penalties.items():
+        first, second = unit_index[unit_of[first]], unit_index[unit_of[second]]
+        if first == second:
+            fixed_penalty += cost
+        else:
+            key = (min(first, second), max(first, second))
+            unit_penalty[key] = unit_penalty.get(key, 0.0) + cost
+    neighbours = [[] for _ in roots]
+    for (first, second), cost in unit_penalty.items():
+        neighbours[second].append((first, cost))
+
+    if count > CONSTRAINED_EXACT_LIMIT:
+        return [_greedy_constrained(members, unit_sizes, unit_totals, apart_units, neighbours, team_size, fixed_penalty)]
+
+    remaining = [0.0] * (len(roots) + 1)
+    for position in range(len(roots) - 1, -1, -1):
+        remaining[position] = remaining[position + 1] + unit_totals[position]
+
+    best = []  # Max-heap by cost via negation: (-cost, sequence, side, difference, penalty)
+    side = [0] * len(roots)  # 1 for team 1, 2 for team 2
+    sequence = 0
+
+    def search(position, size1, size2, total1, total2, penalty):
+        nonlocal sequence
+        gap = total1 - total2
+        # The unplaced units can close the rating gap by at most their total
+        lower_bound = max(0.0, abs(gap) - remaining[position]) + penalty
+        if len(best) == limit and lower_bound >= -best[0][0]:
+            return
+        if position == len(roots):
+            cost = abs(gap) + penalty
+            sequence += 1
+            entry = (-cost, sequence, list(side), abs(gap), penalty)
+            if len(best) < limit:
+                heapq.heappush(best, entry)
+            else:
+                heapq.heapreplace(best, entry)
+            return
+
+        size = unit_sizes[position]
+        # Pin the first unit to team 1 so mirrored splits are searched once
+        for team in ((1,) if position == 0 else (1, 2)):
+            if (size1 if team == 1 else size2) + size > team_size:
+                continue
+            if any(side[other] == team for other in apart_units[position] if other < position):
+                continue
+            added = sum(cost for other, cost in neighbours[position] if side[other] == team)
+            side[position] = team
+            if team == 1:
+                search(position + 1, size1 + size, size2, total1 + unit_totals[position], total2, penalty + added)
+            else:
+                search(position + 1, size1, size2 + size, total1, total2 + unit_totals[position], penalty + added)
+            side[position] = 0
+
+    search(0, 0, 0, 0.0, 0.0, fixed_penalty)
+    if not best:
+        raise ValueError("No team split satisfies the constraints")
+
+    results = []
+    for _, _, sides, difference, penalty in sorted(best, reverse=True):
+        team1 = sorted(index for position, unit in enumerate(members) if sides[position] == 1 for index in unit)
+        team2 = sorted(index for position, unit in enumerate(members) if sides[position] == 2 for index in unit)
+        results.append(Partition(team1, team2, difference, penalty))
+    return results
+
+def _greedy_constrained(members, unit_sizes, unit_totals, apart_units, neighbours, team_size, fixed_penalty):
+    """Place units largest first on whichever allowed side costs least, then improve with swaps"""
+    side = [0] * len(members)
+    sizes = {1: 0, 2: 0}
+    totals = {1: 0.0, 2: 0.0}
+
+    def added_penalty(position, team):
+        # neighbours only lists lower positions, so check both directions
+        cost = sum(cost for other, cost in neighbours[position] if side[other] == team)
+        for other in range(position + 1, len(members)):
+            if side[other] == team:
+                cost += sum(cost for previous, cost in neighbours[other] if previous == position)
+        return cost
+
+    # Big groups are hardest to fit, so place them before single players
+    for position in sorted(range(len(members)), key=lambda position: (-unit_sizes[position], -unit_totals[position])):
+        choices = []
+        for team in (1, 2):
+            if sizes[team] + unit_sizes[position] > team_size:
+                continue
+            if any(side[other] == team for other in apart_units[position]):
+                continue
+            signed = unit_totals[position] if team == 1 else -unit_totals[position]
+            choices.append((abs(totals[1] - totals[2] + signed) + added_penalty(position, team), team))
+        if not choices:
+            raise ValueError("No team split satisfies the constraints")
+        team = min(choices)[1]
+        side[position] = team
+        sizes[team] += unit_sizes[position]
+        totals[team] += unit_totals[position]
+
+    def total_penalty():
+        return fixed_penalty + sum(
+            cost for position in range(len(members))
+            for other, cost in neighbours[position] if side[other] == side[position]
+        )
+
+    # Swap equally sized units across teams while that lowers the cost
+    cost = abs(totals[1] - totals[2]) + total_penalty()
+    improved = True
+    while improved:
+        improved = False
+        for first in range(len(members)):
+            for second in range(len(members)):
+                if side[first] != 1 or side[second] != 2 or unit_sizes[first] != unit_sizes[second]:
+                    continue
+                side[first], side[second] = 2, 1
+                allowed = not any(side[other] == side[unit] for unit in (first, second) for other in apart_units[unit])
+                if allowed:
+                    shift = 2 * (unit_totals[second] - unit_totals[first])
+                    new_cost = abs(totals[1] - totals[2] + shift) + total_penalty()
+                    if new_cost < cost - 1e-9:
+                        totals[1] += unit_totals[second] - unit_totals[first]
+                        totals[2] += unit_totals[first] - unit_totals[second]
+                        cost = new_cost
+                        improved = True
+                        continue
+                side[first], side[second] = 1, 2
+
+    team1 = sorted(index for position, unit in enumerate(members) if side[position] == 1 for index in unit)
+    team2 = sorted(index for position, unit in enumerate(members) if side[position] == 2 for index in unit)
+    return Partition(team1, team2, abs(totals[1] - totals[2]), total_penalty())
+
+def game_sizes(count, max_players):
+    """Split an even lobby into the fewest games of at most `max_players`, sizes as equal as possible"""
+    if count % 2:
+        raise ValueError("Teams need an even number of players")
+    games = -(-count // (max_players - max_players % 2))
+    pairs, extra = divmod(count // 2, games)
+    return [2 * (pairs + 1)] * extra + [2 * pairs] * (games - extra)
+
+def split_lobby(ratings, sizes, time_budget, seed=None):
+    """Split a lobby into several games, each with two balanced teams.
+
+    Players start in rating tiers (strongest players in the first game)
+    and each game is split exactly with `best_partitions`. Players are then
+    swapped between games while that lowers the summed team imbalance,
+    until `time_budget` seconds have passed. Returns one Partition per game
+    with indices into `ratings`.
+    """
+    rng = random.Random(seed)
+    deadline = time.perf_counter() + time_budget
+    order = sorted(range(len(ratings)), key=lambda index: -ratings[index])
+
+    games = []
+    start = 0
+    for size in sizes:
+        games.append(order[start:start + size])
+        start += size
+
+    def evaluate(players):
+        return best_partitions([ratings[index] for index in players])[0]
+
+    partitions = [evaluate(players) for players in games]
+    if len(games) > 1:
+        while time.perf_counter() < deadline:
+            first, second = rng.sample(range(len(games)), 2)
+            i = rng.randrange(len(games[first]))
+            j = rng.randrange(len(games[second]))
+            games[first][i], games[second][j] = games[second][j], games[first][i]
+            candidate_first = evaluate(games[first])
+            candidate_second = evaluate(games[second])
+            before = partitions[first].difference + partitions[second].difference
+            if candidate_first.difference + candidate_second.difference < before - 1e-9:
+                partitions[first], partitions[second] = candidate_first, candidate_second
+            else:
+                games[first][i], games[second][j] = games[second][j], games[first][i]
+
+    # Map positions inside each game back to lobby indices
+    return [
+        Partition(
+            [players[position] for position in partition.team1],
+            [players[position] for position in partition.team2],
+            partition.difference
+        )
+        for players, partition in zip(games, partitions)
+    ]
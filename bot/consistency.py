@@ -0,0 +1,75 @@
+import logging
+from array import array
+from bot.event_log import GAME_CANCELLED
+from bot.player_stats import PlayerStats
+
+logger = logging.getLogger(__name__)
+
+class ConsistencyReport:
+    """Result of checking player stats against the game log"""
+
+    def __init__(self):
+        self.games_scanned = 0
+        self.completed_games = 0
+        self.cancelled_games = 0
+        self.unfinished_numbers = array('I')  # Started games that never got a result
+        self.rebuilt = {}  # user_id -> PlayerStats rebuilt from the log
+        self.mismatches = []  # (user_id, expected PlayerStats, actual PlayerStats)
+
+    @property
+    def is_consistent(self):
+        return not self.mismatches and not self.unfinished_numbers
+
+def rebuild_player_stats(games, skip_numbers=()):
+    """Rebuild win/loss totals from a stream of game log entries.
+
+    Games are consumed one at a time, so memory grows with the number of
+    players rather than the number of games. Games listed in `skip_numbers`
+    (still being played) are not reported as unfinished.
+    """
+    report = ConsistencyReport()
+    totals = {}  # user_id -> [wins, losses]
+
+    for game in games:
+        report.games_scanned += 1
+        winner = game.get("winner")
+
+        if winner in (1, 2):
+            report.completed_games += 1
+            for team, won in ((game["team1"], winner == 1), (game["team2"], winner == 2)):
+                for player in team:
+                    counts = totals.get(player["id"])
+                    if counts is None:
+                        counts = totals[player["id"]] = [0, 0]
+                    counts[0 if won else 1] += 1
+        elif game.get("status") == GAME_CANCELLED:
+            report.cancelled_games += 1
+        elif game["game_number"] not in skip_numbers:
+            report.unfinished_numbers.append(game["game_number"])
+
+    report.rebuilt = {
+        user_id: PlayerStats(wins + losses, wins, losses)
+        for user_id, (wins, losses) in totals.items()
+    }
+    return report
+
+def diff_player_stats(report, player_stats):
+    """Record every player whose live totals differ from the rebuilt ones"""
+    report.mismatches = []
+    for user_id in report.rebuilt.keys() | player_stats.keys():
+        expected = report.rebuilt.get(user_id) or PlayerStats()
+        actual = player_stats.get(user_id) or PlayerStats()
+        if (expected.games_played, expected.wins, expected.losses) != (actual.games_played, actual.wins, actual.losses):
+            report.mismatches.append((user_id, expected, actual))
+    report.mismatches.sort(key=lambda mismatch: mismatch[0])
+    return report
+
+def check_consistency(games, player_stats, skip_numbers=()):
+    """Stream the game log once and diff the rebuilt totals against live stats"""
+    report = rebuild_player_stats(games, skip_numbers)
+    diff_player_stats(report, player_stats)
+    logger.info(
+        f"Checked {report.games_scanned} games: {len(report.mismatches)} mismatched players, "
+        f"{len(report.unfinished_numbers)} unfinished games"
+    )
+    return report
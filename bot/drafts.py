@@ -3,6 +3,8 @@ import random
 import asyncio
 import logging
 from config import Config
+from bot.balance import best_partitions, game_sizes, split_lobby
+from bot.ratings import expected_score
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +14,141 @@ class DraftManager:
         self.min_players = Config.MIN_PLAYERS
         self.max_players = Config.MAX_PLAYERS
     
+    def draft_options(self, members, together=(), apart=()):
+        """Rank the most balanced distinct team splits for a draft, best first.
+        
+        Members are shuffled first so equally rated players land on random
+        sides. `together` is a list of member id groups that must share a
+        team and `apart` a list of member id pairs that must not. Pairs who
+        were teammates in their recent games are split up where the rating
+        cost allows. Each option holds both teams, a 0-100 balance score,
+        team 1's expected chance to win and the number of repeat pairings.
+        Raises ValueError if the constraints can't be met.
+        """
+        members = members.copy()
+        random.shuffle(members)
+        position = {member.id: index for index, member in enumerate(members)}
+        ratings = [self.bot.stats_manager.get_player_stats(member.id).rating for member in members]
+        
+        recent = self.bot.stats_manager.get_recent_teammates(position, Config.TEAMMATE_HISTORY_GAMES)
+        penalties = {
+            (position[first], position[second]): Config.TEAMMATE_PENALTY * count
+            for (first, second), count in recent.items()
+        }
+        partitions = best_partitions(
+            ratings,
+            limit=Config.DRAFT_OPTIONS,
+            together=[[position[user_id] for user_id in group] for group in together],
+            apart=[(position[first], position[second]) for first, second in apart],
+            penalties=penalties
+        )
+        
+        options = []
+        for partition in partitions:
+            team1 = set(partition.team1)
+            repeat_pairs = sum(1 for first, second in penalties if (first in team1) == (second in team1))
+            options.append(self._build_option(
+                [members[index] for index in partition.team1],
+                [members[index] for index in partition.team2],
+                repeat_pairs
+            ))
+        return options
+    
+    def _build_option(self, team1, team2, repeat_pairs=0):
+        """Describe one team split: averages, team 1 win chance and a 0-100 balance score"""
+        stats_manager = self.bot.stats_manager
+        team1_average = sum(stats_manager.get_player_stats(member.id).rating for member in team1) / len(team1)
+        team2_average = sum(stats_manager.get_player_stats(member.id).rating for member in team2) / len(team2)
+        win_chance = expected_score(team1_average, team2_average)
+        return {
+            'team1': team1,
+            'team2': team2,
+            'team1_average': team1_average,
+            'team2_average': team2_average,
+            'win_chance': win_chance,
+            'balance': round(100 * (1 - abs(2 * win_chance - 1))),
+            'repeat_pairs': repeat_pairs
+        }
+    
+    async def split_options(self, members):
+        """Split a lobby bigger than MAX_PLAYERS into several balanced games"""
+        members = members.copy()
+        random.shuffle(members)
+        ratings = [self.bot.stats_manager.get_player_stats(member.id).rating for member in members]
+        # The swap search runs for its whole time budget, so keep it off the event loop
+        partitions = await asyncio.to_thread(
+            split_lobby, ratings, game_sizes(len(members), self.max_players), Config.LOBBY_SPLIT_SECONDS
+        )
+        return [
+            self._build_option(
+                [members[index] for index in partition.team1],
+                [members[index] for index in partition.team2]
+            )
+            for partition in partitions
+        ]
+    
+    def build_split_embed(self, title, color, games):
+        """Embed listing every game of a split lobby with its teams and balance"""
+        embed = discord.Embed(
+            title=title,
+            description=f"{sum(len(game['team1']) + len(game['team2']) for game in games)} players split into {len(games)} balanced games",
+            color=color
+        )
+        
+        for number, game in enumerate(games, 1):
+            embed.add_field(
+                name=f"Game {number} - Balance {game['balance']}/100",
+                value=(
+                    f"🔴 **Team 1** ({game['team1_average']:.0f} avg): "
+                    + ", ".join(member.display_name for member in game['team1'])
+                    + f"\n🔵 **Team 2** ({game['team2_average']:.0f} avg): "
+                    + ", ".join(member.display_name for member in game['team2'])
+                )[:1024],
+                inline=False
+            )
+        return embed
+    
+    def build_draft_embed(self, title, color, options, index, together=(), apart=()):
+        """Draft embed for the selected option with the scores of every option"""
+        option = options[index]
+        description = (
+            f"Teams balanced by rating - option {index + 1} of {len(options)}\n"
+            f"**Balance:** {option['balance']}/100 "
+            f"(Team 1 win chance {option['win_chance'] * 100:.0f}%)"
+        )
+        if option['repeat_pairs']:
+            description += f"\n**Repeat teammates:** {option['repeat_pairs']} pairs from recent games"
+        embed = discord.Embed(title=title, description=description, color=color)
+        
+        team1_names = [member.display_name for member in option['team1']]
+        team2_names = [member.display_name for member in option['team2']]
+        
+        embed.add_field(
+            name=f"🔴 Team 1 ({option['team1_average']:.0f} avg)",
+            value="\n".join(team1_names),
+            inline=True
+        )
+        
+        embed.add_field(
+            name=f"🔵 Team 2 ({option['team2_average']:.0f} avg)",
+            value="\n".join(team2_names),
+            inline=True
+        )
+        
+        if len(options) > 1:
+            scores = " · ".join(
+                f"**[{number}: {other['balance']}]**" if number == index + 1 else f"{number}: {other['balance']}"
+                for number, other in enumerate(options, 1)
+            )
+            embed.add_field(name="Balance by Option", value=scores, inline=False)
+        
+        if together or apart:
+            names = {member.id: member.display_name for member in option['team1'] + option['team2']}
+            lines = ["🤝 " + " + ".join(names[user_id] for user_id in group) for group in together]
+            lines += [f"↔️ {names[first]} / {names[second]}" for first, second in apart]
+            embed.add_field(name="Constraints", value="\n".join(lines), inline=False)
+        return embed
+    
     async def start_draft(self, interaction, voice_channel, members):
         """Start the draft process"""
         if len(members) % 2 != 0:
@@ -21,95 +158,96 @@ class DraftManager:
             )
             return
         
-        # Create teams
-        shuffled_members = members.copy()
-        random.shuffle(shuffled_members)
+        # Event-night lobbies are split into several games at once
+        if len(members) > self.max_players:
+            games = await self.split_options(members)
+            embed = self.build_split_embed("🎮 Lobby Split Created", discord.Color.green(), games)
+            view = self.LobbySplitView(voice_channel, members, games)
+            await interaction.response.send_message(embed=embed, view=view)
+            return
         
-        mid_point = len(shuffled_members) // 2
-        team1 = shuffled_members[:mid_point]
-        team2 = shuffled_members[mid_point:]
+        # Rank the best splits once; rerolls step through them
+        options = self.draft_options(members)
         
         # Create draft embed
+        embed = self.build_draft_embed("🎮 Game Draft Created", discord.Color.green(), options, 0)
+        
+        view = self.DraftControlView(voice_channel, members, options)
+        await interaction.response.send_message(embed=embed, view=view)
+    
+    async def provision_game(self, guild, voice_channel, team1, team2, started_by):
+        """Create channels, move players and register a game; returns (game_id, channels) or None"""
+        # Create voice channels and move players
+        game_data = await self.bot.voice_manager.create_game_channels(
+            guild, voice_channel, team1, team2
+        )
+        
+        if not game_data:
+            return None
+        
+        # Get next game number and log the game
+        game_number = self.bot.stats_manager.get_next_game_number()
+        
+        # Store active game
+        game_id = f"{guild.id}_{game_number}"
+        self.bot.active_games[game_id] = {
+            'game_number': game_number,
+            'team1': [member.id for member in team1],
+            'team2': [member.id for member in team2],
+            'category_id': game_data['category'].id,
+            'team1_channel_id': game_data['team1_channel'].id,
+            'team2_channel_id': game_data['team2_channel'].id,
+            'started_by': started_by.id,
+            'voice_channel_name': voice_channel.name
+        }
+        
+        # Log game start
+        await self.bot.stats_manager.log_game_start(
+            guild, game_number, team1, team2
+        )
+        return game_id, game_data
+    
+    def build_game_embed(self, game_id, game_data, team1, team2):
+        """Game control embed with each team's channel and players"""
+        game_number = self.bot.active_games[game_id]['game_number']
         embed = discord.Embed(
-            title="🎮 Game Draft Created",
-            description="Teams have been randomly generated!",
+            title=f"🎮 Game #{game_number} Started!",
+            description="Players have been moved to their team channels.",
             color=discord.Color.green()
         )
         
-        team1_names = [member.display_name for member in team1]
-        team2_names = [member.display_name for member in team2]
-        
         embed.add_field(
             name="🔴 Team 1",
-            value="\n".join(team1_names),
+            value=f"{game_data['team1_channel'].mention}\n" + 
+                  "\n".join([member.mention for member in team1]),
             inline=True
         )
         
         embed.add_field(
-            name="🔵 Team 2", 
-            value="\n".join(team2_names),
+            name="🔵 Team 2",
+            value=f"{game_data['team2_channel'].mention}\n" + 
+                  "\n".join([member.mention for member in team2]),
             inline=True
         )
-        
-        view = self.DraftControlView(voice_channel, team1, team2)
-        await interaction.response.send_message(embed=embed, view=view)
+        return embed
     
     async def start_game(self, interaction, voice_channel, team1, team2):
         """Actually start the game with voice channel management"""
         try:
-            # Create voice channels and move players
-            game_data = await self.bot.voice_manager.create_game_channels(
-                interaction.guild, voice_channel, team1, team2
+            provisioned = await self.provision_game(
+                interaction.guild, voice_channel, team1, team2, interaction.user
             )
             
-            if not game_data:
+            if not provisioned:
                 await interaction.followup.send(
                     "❌ Failed to create game channels. Please try again.",
                     ephemeral=True
                 )
                 return
             
-            # Get next game number and log the game
-            game_number = self.bot.stats_manager.get_next_game_number()
-            
-            # Store active game
-            game_id = f"{interaction.guild.id}_{game_number}"
-            self.bot.active_games[game_id] = {
-                'game_number': game_number,
-                'team1': [member.id for member in team1],
-                'team2': [member.id for member in team2],
-                'category_id': game_data['category'].id,
-                'team1_channel_id': game_data['team1_channel'].id,
-                'team2_channel_id': game_data['team2_channel'].id,
-                'started_by': interaction.user.id,
-                'voice_channel_name': voice_channel.name
-            }
-            
-            # Log game start
-            await self.bot.stats_manager.log_game_start(
-                interaction.guild, game_number, team1, team2
-            )
-            
             # Create game control embed
-            embed = discord.Embed(
-                title=f"🎮 Game #{game_number} Started!",
-                description="Players have been moved to their team channels.",
-                color=discord.Color.green()
-            )
-            
-            embed.add_field(
-                name="🔴 Team 1",
-                value=f"{game_data['team1_channel'].mention}\n" + 
-                      "\n".join([member.mention for member in team1]),
-                inline=True
-            )
-            
-            embed.add_field(
-                name="🔵 Team 2",
-                value=f"{game_data['team2_channel'].mention}\n" + 
-                      "\n".join([member.mention for member in team2]),
-                inline=True
-            )
+            game_id, game_data = provisioned
+            embed = self.build_game_embed(game_id, game_data, team1, team2)
             
             view = self.GameControlView(game_id)
             try:
@@ -125,12 +263,74 @@ class DraftManager:
                 ephemeral=True
             )
     
+    async def start_split_games(self, interaction, voice_channel, games):
+        """Provision every game of a split lobby in parallel and post one summary"""
+        await interaction.response.defer()
+        results = await asyncio.gather(
+            *(
+                self.provision_game(interaction.guild, voice_channel, game['team1'], game['team2'], interaction.user)
+                for game in games
+            ),
+            return_exceptions=True
+        )
+        
+        embed = discord.Embed(
+            title="🎮 Lobby Games Started!",
+            description="Players have been moved to their team channels. Use the buttons to manage each game.",
+            color=discord.Color.green()
+        )
+        
+        game_ids = []
+        for game, result in zip(games, results):
+            if isinstance(result, Exception) or not result:
+                if isinstance(result, Exception):
+                    logger.error(f"Error starting split lobby game: {result}")
+                embed.add_field(
+                    name="❌ Failed to start",
+                    value=", ".join(member.display_name for member in game['team1'] + game['team2'])[:1024],
+                    inline=False
+                )
+                continue
+            
+            game_id, game_data = result
+            game_ids.append(game_id)
+            game_number = self.bot.active_games[game_id]['game_number']
+            embed.add_field(
+                name=f"Game #{game_number} - Balance {game['balance']}/100",
+                value=(
+                    f"🔴 {game_data['team1_channel'].mention}: "
+                    + ", ".join(member.mention for member in game['team1'])
+                    + f"\n🔵 {game_data['team2_channel'].mention}: "
+                    + ", ".join(member.mention for member in game['team2'])
+                )[:1024],
+                inline=False
+            )
+        
+        view = LobbyGamesView(game_ids) if game_ids else None
+        await interaction.edit_original_response(embed=embed, view=view)
+    
     class DraftControlView(discord.ui.View):
-        def __init__(self, voice_channel, team1, team2):
+        def __init__(self, voice_channel, members, options):
             super().__init__(timeout=300)  # 5 minute timeout
             self.voice_channel = voice_channel
-            self.team1 = team1
-            self.team2 = team2
+            self.members = members
+            self.options = options
+            self.index = 0
+            self.together = []  # Member id groups that must share a team
+            self.apart = []  # Member id pairs that must be on opposite teams
+            
+            # Select menus list at most 25 members and need someone to pair up
+            if 2 < len(members) <= 25:
+                self.add_item(DraftConstraintSelect("together", members))
+                self.add_item(DraftConstraintSelect("apart", members))
+        
+        @property
+        def team1(self):
+            return self.options[self.index]['team1']
+        
+        @property
+        def team2(self):
+            return self.options[self.index]['team2']
         
         @discord.ui.button(label="Cancel", style=discord.ButtonStyle.danger, emoji="❌", custom_id="draft_cancel")
         async def cancel_draft(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -143,36 +343,30 @@ class DraftManager:
         
         @discord.ui.button(label="Reroll Teams", style=discord.ButtonStyle.secondary, emoji="🎲", custom_id="draft_reroll")
         async def reroll_teams(self, interaction: discord.Interaction, button: discord.ui.Button):
-            # Reroll teams
-            all_members = self.team1 + self.team2
-            random.shuffle(all_members)
-            
-            mid_point = len(all_members) // 2
-            self.team1 = all_members[:mid_point]
-            self.team2 = all_members[mid_point:]
+            # Step to the next precomputed split, wrapping after the last one
+            self.index = (self.index + 1) % len(self.options)
             
             # Update embed
-            embed = discord.Embed(
-                title="🎮 Teams Rerolled!",
-                description="New random teams have been generated!",
-                color=discord.Color.orange()
-            )
-            
-            team1_names = [member.display_name for member in self.team1]
-            team2_names = [member.display_name for member in self.team2]
-            
-            embed.add_field(
-                name="🔴 Team 1",
-                value="\n".join(team1_names),
-                inline=True
+            embed = interaction.client.draft_manager.build_draft_embed(
+                "🎮 Teams Rerolled!", discord.Color.orange(), self.options, self.index, self.together, self.apart
             )
             
-            embed.add_field(
-                name="🔵 Team 2",
-                value="\n".join(team2_names),
-                inline=True
+            await interaction.response.edit_message(embed=embed, view=self)
+        
+        @discord.ui.button(label="Clear Constraints", style=discord.ButtonStyle.secondary, emoji="🧹", custom_id="draft_clear_constraints")
+        async def clear_constraints(self, interaction: discord.Interaction, button: discord.ui.Button):
+            self.together = []
+            self.apart = []
+            await self.apply_constraints(interaction, "🎮 Constraints Cleared")
+        
+        async def apply_constraints(self, interaction, title):
+            """Recompute the ranked splits after the constraints changed"""
+            draft_manager = interaction.client.draft_manager
+            self.options = draft_manager.draft_options(self.members, self.together, self.apart)
+            self.index = 0
+            embed = draft_manager.build_draft_embed(
+                title, discord.Color.blue(), self.options, self.index, self.together, self.apart
             )
-            
             await interaction.response.edit_message(embed=embed, view=self)
         
         @discord.ui.button(label="Start Game", style=discord.ButtonStyle.success, emoji="🚀", custom_id="draft_start_game")
@@ -181,6 +375,37 @@ class DraftManager:
                 interaction, self.voice_channel, self.team1, self.team2
             )
     
+    class LobbySplitView(discord.ui.View):
+        def __init__(self, voice_channel, members, games):
+            super().__init__(timeout=300)  # 5 minute timeout
+            self.voice_channel = voice_channel
+            self.members = members
+            self.games = games
+        
+        @discord.ui.button(label="Cancel", style=discord.ButtonStyle.danger, emoji="❌", custom_id="split_cancel")
+        async def cancel_split(self, interaction: discord.Interaction, button: discord.ui.Button):
+            embed = discord.Embed(
+                title="❌ Draft Cancelled",
+                description="The lobby split has been cancelled.",
+                color=discord.Color.red()
+            )
+            await interaction.response.edit_message(embed=embed, view=None)
+        
+        @discord.ui.button(label="Reshuffle", style=discord.ButtonStyle.secondary, emoji="🎲", custom_id="split_reshuffle")
+        async def reshuffle(self, interaction: discord.Interaction, button: discord.ui.Button):
+            # A fresh search from a new shuffle finds a different balanced split
+            draft_manager = interaction.client.draft_manager
+            self.games = await draft_manager.split_options(self.members)
+            embed = draft_manager.build_split_embed("🎮 Lobby Reshuffled!", discord.Color.orange(), self.games)
+            await interaction.response.edit_message(embed=embed, view=self)
+        
+        @discord.ui.button(label="Start All Games", style=discord.ButtonStyle.success, emoji="🚀", custom_id="split_start_games")
+        async def start_games(self, interaction: discord.Interaction, button: discord.ui.Button):
+            self.stop()
+            await interaction.client.draft_manager.start_split_games(
+                interaction, self.voice_channel, self.games
+            )
+    
     class GameControlView(discord.ui.View):
         def __init__(self, game_id):
             super().__init__(timeout=None)  # Persistent view
@@ -260,6 +485,88 @@ class DraftManager:
             await interaction.response.edit_message(embed=embed, view=None)
 
 
+class LobbyGamesView(discord.ui.View):
+    """One control button per game started from a split lobby"""
+    
+    def __init__(self, game_ids):
+        super().__init__(timeout=None)
+        for game_id in game_ids[:25]:
+            self.add_item(LobbyGameButton(game_id))
+
+class LobbyGameButton(discord.ui.DynamicItem[discord.ui.Button], template=r"lobby_game_(?P<game_id>[0-9]+_[0-9]+)"):
+    """Per-game button routed by its custom id, so it keeps working after a restart"""
+    
+    def __init__(self, game_id):
+        self.game_id = game_id
+        game_number = game_id.rsplit("_", 1)[1]
+        super().__init__(
+            discord.ui.Button(
+                label=f"Game #{game_number}",
+                style=discord.ButtonStyle.primary,
+                emoji="🏁",
+                custom_id=f"lobby_game_{game_id}"
+            )
+        )
+    
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(match["game_id"])
+    
+    async def callback(self, interaction: discord.Interaction):
+        """Open the usual end/cancel controls for this game"""
+        game_data = interaction.client.active_games.get(self.game_id)
+        if game_data is None:
+            await interaction.response.send_message("❌ This game is no longer active.", ephemeral=True)
+            return
+        
+        embed = discord.Embed(
+            title=f"🎮 Game #{game_data['game_number']}",
+            description="End or cancel this game.",
+            color=discord.Color.blue()
+        )
+        view = DraftManager.GameControlView(self.game_id)
+        await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+
+class DraftConstraintSelect(discord.ui.Select):
+    """Pick lobby members to keep together or apart in a draft"""
+    
+    def __init__(self, mode, members):
+        self.mode = mode
+        if mode == "together":
+            placeholder = "🤝 Keep players together (premade party)..."
+            max_values = len(members) // 2
+        else:
+            placeholder = "↔️ Keep two players apart..."
+            max_values = 2
+        
+        options = [
+            discord.SelectOption(label=member.display_name[:100], value=str(member.id))
+            for member in members
+        ]
+        super().__init__(
+            placeholder=placeholder,
+            min_values=2,
+            max_values=max_values,
+            options=options,
+            custom_id=f"draft_{mode}",
+            row=1 if mode == "together" else 2
+        )
+    
+    async def callback(self, interaction: discord.Interaction):
+        view = self.view
+        selected = [int(value) for value in self.values]
+        if self.mode == "together":
+            view.together.append(selected)
+        else:
+            view.apart.append((selected[0], selected[1]))
+        
+        try:
+            await view.apply_constraints(interaction, "🎮 Teams Updated")
+        except ValueError as e:
+            # Drop the constraint that made the draft impossible
+            (view.together if self.mode == "together" else view.apart).pop()
+            await interaction.response.send_message(f"❌ {e}", ephemeral=True)
+
 class WinnerSelectionView(discord.ui.View):
     def __init__(self, game_id):
         super().__init__(timeout=300)  # 5 minute timeout
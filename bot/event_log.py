@@ -0,0 +1,226 @@
+import asyncio
+import json
+import logging
+import os
+from bot.persistence import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+GAME_ALLOCATED = "allocated"
+GAME_STARTED = "started"
+GAME_COMPLETED = "completed"
+GAME_CANCELLED = "cancelled"
+
+def empty_game_log():
+    """Return an empty game log document"""
+    return {"games": [], "last_game_number": 0}
+
+def apply_game_event(game_log, event, archive=None, index=None):
+    """Apply a single game event to an in-memory game log.
+
+    Events are idempotent so a log tail that was already folded into the
+    snapshot can be replayed safely after a crash during compaction. Games
+    that have moved to the archive are updated there instead. `index` is an
+    optional game_number -> entry map used instead of scanning the log.
+    """
+    kind = event.get("event")
+    game_number = event.get("game_number")
+
+    if kind == GAME_ALLOCATED:
+        game_log["last_game_number"] = max(game_log.get("last_game_number", 0), game_number)
+        return None
+
+    if kind == GAME_STARTED:
+        game_log["last_game_number"] = max(game_log.get("last_game_number", 0), game_number)
+        if archive is not None and archive.covers(game_number):
+            return None
+        entry = find_game(game_log, game_number, index)
+        if entry is None:
+            entry = dict(event["game"])
+            game_log["games"].append(entry)
+        return entry
+
+    if kind in (GAME_COMPLETED, GAME_CANCELLED):
+        fields = {
+            "status": kind,
+            "winner": event.get("winner"),
+            "end_timestamp": event.get("end_timestamp")
+        }
+        if archive is not None and archive.covers(game_number):
+            return archive.update_game(game_number, fields)
+        entry = find_game(game_log, game_number, index)
+        if entry is not None:
+            entry.update(fields)
+        return entry
+
+    logger.warning(f"Ignoring unknown game event: {kind}")
+    return None
+
+def find_game(game_log, game_number, index=None):
+    """Find a game entry by number, searching the most recent games first"""
+    if index is not None:
+        return index.get(game_number)
+    for game in reversed(game_log["games"]):
+        if game.get("game_number") == game_number:
+            return game
+    return None
+
+class GameEventLog:
+    """Append-only JSONL log of game events backed by a compacted snapshot.
+
+    When an archive is attached, compaction also moves the oldest games out
+    of the snapshot into compressed archive segments.
+    """
+
+    def __init__(self, snapshot_file, log_file, compact_threshold, archive=None):
+        self.archive = archive
+        self.snapshot_file = snapshot_file
+        self.log_file = log_file
+        self.compact_threshold = compact_threshold
+        self.pending_events = 0
+        self._handle = None
+        self._compact_task = None
+
+    def load(self):
+        """Rebuild the game log from the snapshot plus the event log tail"""
+        game_log = empty_game_log()
+        try:
+            if os.path.exists(self.snapshot_file):
+                with open(self.snapshot_file, 'r') as f:
+                    game_log = json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading game log snapshot: {e}")
+
+        if self.archive is not None:
+            self.archive.drop_archived(game_log)
+
+        self.pending_events = 0
+        if os.path.exists(self.log_file):
+            with open(self.log_file, 'r') as f:
+                for line_number, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    self.pending_events += 1
+                    try:
+                        event = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn final line from a crash mid-append
+                        logger.warning(f"Skipping corrupt game event on line {line_number}")
+                        continue
+                    apply_game_event(game_log, event, self.archive)
+
+        return game_log
+
+    def append(self, event):
+        """Append one event to the log without rewriting earlier history"""
+        if self._handle is None:
+            self._handle = self._open_for_append()
+        self._handle.write(json.dumps(event) + "\n")
+        self._handle.flush()
+        self.pending_events += 1
+
+    def _open_for_append(self):
+        """Open the log, terminating a torn final line left by a crash"""
+        torn = False
+        if os.path.exists(self.log_file) and os.path.getsize(self.log_file) > 0:
+            with open(self.log_file, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                torn = f.read(1) != b"\n"
+
+        handle = open(self.log_file, 'a')
+        if torn:
+            handle.write("\n")
+        return handle
+
+    def needs_compaction(self, game_log):
+        if self.archive is not None and self.archive.needs_seal(game_log):
+            return True
+        return self.pending_events >= self.compact_threshold
+
+    def schedule_compaction(self, game_log):
+        """Compact in the background once enough events have accumulated"""
+        if not self.needs_compaction(game_log):
+            return
+        if self._compact_task and not self._compact_task.done():
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.compact(game_log)
+            return
+
+        self._compact_task = loop.create_task(self.compact_async(game_log))
+
+    async def compact_async(self, game_log):
+        """Fold the event log into the snapshot off the event loop"""
+        if self.archive is not None:
+            while True:
+                games = self.archive.take_sealable(game_log)
+                if not games:
+                    break
+                try:
+                    entry = await asyncio.to_thread(self.archive.write_segment, games)
+                except Exception as e:
+                    logger.error(f"Error archiving games: {e}")
+                    break
+                self.archive.commit_segment(game_log, entry, games)
+
+        snapshot = self._copy_game_log(game_log)
+        folded = self.pending_events
+        try:
+            await asyncio.to_thread(write_json_atomic, self.snapshot_file, snapshot)
+        except Exception as e:
+            logger.error(f"Error compacting game log: {e}")
+            return
+
+        # Events appended while the snapshot was being written stay in the log
+        self._truncate(folded)
+
+    def compact(self, game_log):
+        """Fold the event log into the snapshot on the calling thread"""
+        if self.archive is not None:
+            while self.archive.needs_seal(game_log):
+                games = self.archive.take_sealable(game_log)
+                entry = self.archive.write_segment(games)
+                self.archive.commit_segment(game_log, entry, games)
+        try:
+            write_json_atomic(self.snapshot_file, self._copy_game_log(game_log))
+        except Exception as e:
+            logger.error(f"Error compacting game log: {e}")
+            return
+        self._truncate(self.pending_events)
+
+    async def close(self, game_log):
+        """Wait for any running compaction and release the log file"""
+        if self._compact_task and not self._compact_task.done():
+            await self._compact_task
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def _copy_game_log(self, game_log):
+        # Entries are mutated in place when games end, so copy them
+        snapshot = dict(game_log)
+        snapshot["games"] = [dict(game) for game in game_log["games"]]
+        return snapshot
+
+    def _truncate(self, folded):
+        """Drop the first `folded` events, which are now part of the snapshot"""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+        remaining = []
+        if os.path.exists(self.log_file):
+            with open(self.log_file, 'r') as f:
+                remaining = [line for line in f if line.strip()][folded:]
+
+        tmp_path = f"{self.log_file}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.writelines(remaining)
+        os.replace(tmp_path, self.log_file)
+
+        self.pending_events = len(remaining)
+        logger.info(f"Compacted game log: folded {folded} events into snapshot")
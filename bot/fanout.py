@@ -0,0 +1,186 @@
+import discord
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Attempts per recipient when Discord keeps rate limiting a send
+MAX_ATTEMPTS = 3
+
+class TokenBucket:
+    """Token bucket whose rate adapts to how quickly Discord accepts sends.
+
+    discord.py sleeps through most 429s inside the request, so a rate limit
+    usually shows up as a send that took longer than `slow_send` seconds.
+    A fast send nudges the rate up by `increase` tokens per second; a slow
+    one halves it. Limits too long for discord.py to wait out surface as
+    errors, which also halve the rate and pause all senders.
+    """
+
+    def __init__(self, rate, max_rate, min_rate=0.5, burst=None, increase=0.05, slow_send=1.5):
+        self.rate = rate
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.burst = burst or max(1.0, rate)
+        self.increase = increase
+        self.slow_send = slow_send
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.rate_limits = 0
+        self.last_backoff = float("-inf")
+
+    async def acquire(self):
+        """Wait until a send is allowed"""
+        while True:
+            now = time.monotonic()
+            if now < self.paused_until:
+                await asyncio.sleep(self.paused_until - now)
+                continue
+
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def on_success(self, latency=0.0):
+        if latency >= self.slow_send:
+            # The library waited out a rate limit before this send went through.
+            # Concurrent sends stall on the same limit, so back off once per stall.
+            now = time.monotonic()
+            if now - self.last_backoff >= latency:
+                self.last_backoff = now
+                self.rate_limits += 1
+                self.rate = max(self.min_rate, self.rate / 2)
+                logger.warning(f"Slow DM send ({latency:.1f}s), slowing to {self.rate:.2f}/s")
+            return
+        self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_rate_limited(self, retry_after):
+        self.rate_limits += 1
+        self.rate = max(self.min_rate, self.rate / 2)
+        self.tokens = 0
+        self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+        logger.warning(f"DM rate limited, retrying in {retry_after:.1f}s at {self.rate:.2f}/s")
+
+class DMFanout:
+    """Send one prebuilt message to many members with bounded concurrency.
+
+    `send(member)` performs a single delivery. Progress is reported by
+    calling `on_progress(fanout)` every `progress_interval` seconds and once
+    more when the run finishes. `on_processed(member, outcome)` is called
+    after each recipient with 'sent', 'forbidden' or 'failed'.
+    """
+
+    def __init__(self, recipients, send, bucket, concurrency, on_progress=None, progress_interval=3, on_processed=None):
+        self.recipients = recipients
+        self.send = send
+        self.bucket = bucket
+        self.concurrency = concurrency
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval
+        self.on_processed = on_processed
+        self.total = len(recipients)
+        self.sent = 0
+        self.forbidden = 0  # Members with DMs closed
+        self.forbidden_members = []
+        self.failed = 0
+        self.started = None
+        self.finished = None
+        self.stopped = False
+
+    @property
+    def processed(self):
+        return self.sent + self.forbidden + self.failed
+
+    @property
+    def elapsed(self):
+        end = self.finished if self.finished is not None else time.monotonic()
+        return end - self.started if self.started is not None else 0.0
+
+    def stop(self):
+        """Stop taking new recipients; sends already in flight still finish"""
+        self.stopped = True
+
+    async def run(self):
+        """Deliver to every recipient, returning once all are processed"""
+        self.started = time.monotonic()
+        pending = iter(self.recipients)
+        workers = [asyncio.create_task(self._worker(pending)) for _ in range(min(self.concurrency, self.total))]
+        reporter = asyncio.create_task(self._report_progress()) if self.on_progress else None
+
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+            self.finished = time.monotonic()
+            if reporter:
+                reporter.cancel()
+
+        if self.on_progress:
+            await self._call_progress()
+        logger.info(
+            f"DM fan-out: {self.sent} sent, {self.forbidden} closed, {self.failed} failed "
+            f"of {self.total} in {self.elapsed:.1f}s"
+        )
+        return self
+
+    async def _worker(self, pending):
+        # Workers share one iterator, so each recipient is taken exactly once
+        for member in pending:
+            if self.stopped:
+                return
+            outcome = await self._deliver(member)
+            if outcome == "sent":
+                self.sent += 1
+            elif outcome == "forbidden":
+                self.forbidden += 1
+                self.forbidden_members.append(member)
+            else:
+                self.failed += 1
+            if self.on_processed:
+                self.on_processed(member, outcome)
+
+    async def _deliver(self, member):
+        for attempt in range(MAX_ATTEMPTS):
+            await self.bucket.acquire()
+            started = time.monotonic()
+            try:
+                await self.send(member)
+                self.bucket.on_success(time.monotonic() - started)
+                return "sent"
+            except discord.Forbidden:
+                return "forbidden"
+            except discord.RateLimited as e:
+                self.bucket.on_rate_limited(e.retry_after)
+            except discord.HTTPException as e:
+                if e.status != 429:
+                    logger.error(f"Error sending DM to {member}: {e}")
+                    return "failed"
+                self.bucket.on_rate_limited(_retry_after(e))
+            except Exception as e:
+                logger.error(f"Error sending DM to {member}: {e}")
+                return "failed"
+        return "failed"
+
+    async def _report_progress(self):
+        while True:
+            await asyncio.sleep(self.progress_interval)
+            await self._call_progress()
+
+    async def _call_progress(self):
+        try:
+            await self.on_progress(self)
+        except Exception as e:
+            logger.error(f"Error reporting fan-out progress: {e}")
+
+def _retry_after(error):
+    """Seconds to wait from a 429 response, defaulting to one second"""
+    try:
+        return float(error.response.headers.get("Retry-After", 1))
+    except Exception:
+        return 1.0
@@ -0,0 +1,220 @@
+import bisect
+import gzip
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from bot.persistence import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+class GameArchive:
+    """Finished history of the game log, stored as compressed segments.
+
+    Each segment is an immutable gzip'd JSON list of consecutive games. A
+    small index records the number and time range of every segment so
+    lookups and history queries only decompress the segments they need. A
+    second file maps each player to their archived game numbers.
+    """
+
+    def __init__(self, directory, segment_size, recent_games, cached_segments=2):
+        self.directory = directory
+        self.index_file = os.path.join(directory, "index.json")
+        self.players_file = os.path.join(directory, "players.json")
+        self.segment_size = segment_size
+        self.recent_games = recent_games
+        self.cached_segments = cached_segments
+        self._cache = OrderedDict()  # segment file -> list of games
+        self._cache_lock = threading.Lock()  # History scans also run in worker threads
+        os.makedirs(directory, exist_ok=True)
+        self.segments = self._load_index()
+
+    def _load_index(self):
+        try:
+            if os.path.exists(self.index_file):
+                with open(self.index_file, 'r') as f:
+                    return json.load(f)["segments"]
+        except Exception as e:
+            logger.error(f"Error loading game archive index: {e}")
+        return []
+
+    @property
+    def last_game_number(self):
+        """Highest game number held in the archive"""
+        return self.segments[-1]["last_game"] if self.segments else 0
+
+    def covers(self, game_number):
+        return game_number is not None and game_number <= self.last_game_number
+
+    def needs_seal(self, game_log):
+        return len(game_log["games"]) >= self.segment_size + self.recent_games
+
+    def take_sealable(self, game_log):
+        """Copy the oldest resident games that should move into a new segment"""
+        if not self.needs_seal(game_log):
+            return []
+        return [dict(game) for game in game_log["games"][:self.segment_size]]
+
+    def write_segment(self, games):
+        """Write a new segment and its index entry (safe to run in a thread)"""
+        first, last = games[0], games[-1]
+        entry = {
+            "file": f"segment_{first['game_number']:08d}.json.gz",
+            "first_game": first["game_number"],
+            "last_game": last["game_number"],
+            "first_timestamp": min(game["timestamp"] for game in games),
+            "last_timestamp": max(game["timestamp"] for game in games),
+            "count": len(games)
+        }
+        self._write_segment_file(entry["file"], games)
+        self._write_player_games(games)
+        write_json_atomic(self.index_file, {"segments": self.segments + [entry]})
+        return entry
+
+    def commit_segment(self, game_log, entry, games):
+        """Drop newly archived games from memory once their segment is on disk"""
+        self.segments.append(entry)
+        archived = [game for game in game_log["games"] if game["game_number"] <= entry["last_game"]]
+        if archived != games:
+            # A result arrived while the segment was being written
+            self._write_player_games(archived)
+            self._write_segment_file(entry["file"], archived)
+
+        game_log["games"] = [
+            game for game in game_log["games"]
+            if game["game_number"] > entry["last_game"]
+        ]
+        logger.info(
+            f"Archived games #{entry['first_game']}-#{entry['last_game']} "
+            f"({entry['count']} games) to {entry['file']}"
+        )
+
+    def drop_archived(self, game_log):
+        """Remove resident copies of games already archived (crash recovery)"""
+        last = self.last_game_number
+        if last:
+            game_log["games"] = [game for game in game_log["games"] if game["game_number"] > last]
+
+    def get_game(self, game_number):
+        """Load a single archived game by number"""
+        segment = self._segment_for(game_number)
+        if segment is None:
+            return None
+        for game in self._read_segment(segment["file"]):
+            if game["game_number"] == game_number:
+                return game
+        return None
+
+    def update_game(self, game_number, fields):
+        """Apply a late result to an archived game by rewriting its segment"""
+        segment = self._segment_for(game_number)
+        if segment is None:
+            return None
+        games = self._read_segment(segment["file"])
+        for game in games:
+            if game["game_number"] == game_number:
+                game.update(fields)
+                self._write_segment_file(segment["file"], games)
+                return game
+        return None
+
+    def iter_games(self, before_number=None, since=None, until=None):
+        """Yield archived games newest first, loading only overlapping segments"""
+        for segment in reversed(self.segments):
+            if before_number is not None and segment["first_game"] >= before_number:
+                continue
+            if since is not None and segment["last_timestamp"] < since:
+                continue
+            if until is not None and segment["first_timestamp"] > until:
+                continue
+            for game in reversed(self._read_segment(segment["file"])):
+                if before_number is not None and game["game_number"] >= before_number:
+                    continue
+                if since is not None and game["timestamp"] < since:
+                    continue
+                if until is not None and game["timestamp"] > until:
+                    continue
+                yield game
+
+    def load_player_games(self, before_number=None):
+        """Map each player id to the ascending numbers of their archived games.
+
+        Archives written before the player file existed are scanned once to
+        create it.
+        """
+        player_games = None
+        try:
+            if os.path.exists(self.players_file):
+                with open(self.players_file, 'r') as f:
+                    player_games = {int(player_id): numbers for player_id, numbers in json.load(f).items()}
+        except Exception as e:
+            logger.error(f"Error loading archived player games: {e}")
+
+        if player_games is None:
+            player_games = {}
+            for segment in self.segments:
+                self._index_players(player_games, self._read_segment(segment["file"]))
+            if player_games:
+                write_json_atomic(self.players_file, player_games)
+                logger.info(f"Indexed archived games of {len(player_games)} players")
+
+        if before_number is not None:
+            # A segment written just before a crash may not be committed yet
+            for player_id, numbers in list(player_games.items()):
+                del numbers[bisect.bisect_left(numbers, before_number):]
+                if not numbers:
+                    del player_games[player_id]
+        return player_games
+
+    def _write_player_games(self, games):
+        player_games = self.load_player_games()
+        self._index_players(player_games, games)
+        write_json_atomic(self.players_file, player_games)
+
+    @staticmethod
+    def _index_players(player_games, games):
+        for game in games:
+            for player in game["team1"] + game["team2"]:
+                numbers = player_games.setdefault(player["id"], [])
+                position = bisect.bisect_left(numbers, game["game_number"])
+                if position == len(numbers) or numbers[position] != game["game_number"]:
+                    numbers.insert(position, game["game_number"])
+
+    def _segment_for(self, game_number):
+        # Segments are ordered by game number, so binary search the index
+        low, high = 0, len(self.segments)
+        while low < high:
+            mid = (low + high) // 2
+            segment = self.segments[mid]
+            if game_number < segment["first_game"]:
+                high = mid
+            elif game_number > segment["last_game"]:
+                low = mid + 1
+            else:
+                return segment
+        return None
+
+    def _read_segment(self, file_name):
+        with self._cache_lock:
+            if file_name in self._cache:
+                self._cache.move_to_end(file_name)
+                return self._cache[file_name]
+
+        with gzip.open(os.path.join(self.directory, file_name), 'rt') as f:
+            games = json.load(f)
+
+        with self._cache_lock:
+            self._cache[file_name] = games
+            while len(self._cache) > self.cached_segments:
+                self._cache.popitem(last=False)
+        return games
+
+    def _write_segment_file(self, file_name, games):
+        path = os.path.join(self.directory, file_name)
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, 'wt') as f:
+            json.dump(games, f)
+        os.replace(tmp_path, path)
+        with self._cache_lock:
+            self._cache.pop(file_name, None)
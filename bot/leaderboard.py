@@ -0,0 +1,162 @@
+from bisect import bisect_left, insort
+from datetime import timedelta
+from bot.player_stats import PlayerStats
+
+class Leaderboard:
+    """Players ranked by wins, then win rate, maintained incrementally.
+
+    Keys are kept in a sorted list so reading the top N is a slice and a
+    player's rank is a binary search for their current key. Ties are
+    broken by the order players were first added, which matches the stable
+    sort over the player_stats dict that the leaderboard used to run.
+    """
+
+    def __init__(self):
+        self._keys = []  # Sorted (-wins, -win_rate, seq, user_id)
+        self._key_of = {}  # user_id -> current key
+        self._seq = {}  # user_id -> first-seen order
+        self._next_seq = 0
+
+    @classmethod
+    def from_stats(cls, player_stats):
+        """Build a leaderboard from a {user_id: PlayerStats} map in one sort"""
+        leaderboard = cls()
+        for user_id, stats in player_stats.items():
+            leaderboard._seq[user_id] = leaderboard._next_seq
+            leaderboard._next_seq += 1
+            if stats.games_played > 0:
+                key = leaderboard._make_key(user_id, stats)
+                leaderboard._key_of[user_id] = key
+                leaderboard._keys.append(key)
+        leaderboard._keys.sort()
+        return leaderboard
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _make_key(self, user_id, stats):
+        return (-stats.wins, -(stats.wins / stats.games_played), self._seq[user_id], user_id)
+
+    def update(self, user_id, stats):
+        """Reposition a player after their stats changed"""
+        if user_id not in self._seq:
+            self._seq[user_id] = self._next_seq
+            self._next_seq += 1
+
+        old_key = self._key_of.pop(user_id, None)
+        if old_key is not None:
+            del self._keys[bisect_left(self._keys, old_key)]
+
+        if stats.games_played > 0:
+            key = self._make_key(user_id, stats)
+            self._key_of[user_id] = key
+            insort(self._keys, key)
+
+    def rank(self, user_id):
+        """1-based position of a player, or None if they have no games"""
+        key = self._key_of.get(user_id)
+        if key is None:
+            return None
+        return bisect_left(self._keys, key) + 1
+
+    def around(self, user_id, radius=2):
+        """(rank, user_id) for a player and up to `radius` players either side"""
+        rank = self.rank(user_id)
+        if rank is None:
+            return []
+        start = max(rank - 1 - radius, 0)
+        return [(start + offset + 1, key[3]) for offset, key in enumerate(self._keys[start:rank + radius])]
+
+    def top(self, limit):
+        """User ids of the best `limit` players, best first"""
+        return [key[3] for key in self._keys[:limit]]
+
+def _day_bucket(moment):
+    return moment.strftime("%Y-%m-%d")
+
+def _week_bucket(moment):
+    year, week, _ = moment.isocalendar()
+    return f"{year}-W{week:02d}"
+
+def _month_bucket(moment):
+    return moment.strftime("%Y-%m")
+
+def _season_bucket(moment):
+    return f"{moment.year}-Q{(moment.month - 1) // 3 + 1}"
+
+# Period name -> function mapping a UTC datetime to its bucket id. Bucket ids
+# of the same period sort chronologically.
+PERIOD_BUCKETS = {
+    "today": _day_bucket,
+    "week": _week_bucket,
+    "month": _month_bucket,
+    "season": _season_bucket
+}
+
+PERIOD_LABELS = {
+    "lifetime": "All Time",
+    "today": "Today",
+    "week": "This Week",
+    "month": "This Month",
+    "season": "This Season"
+}
+
+def period_start(period, now):
+    """Start of the bucket containing `now` for a period"""
+    day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == "today":
+        return day
+    if period == "week":
+        return day - timedelta(days=day.weekday())
+    if period == "month":
+        return day.replace(day=1)
+    if period == "season":
+        return day.replace(month=(day.month - 1) // 3 * 3 + 1, day=1)
+    raise ValueError(f"Unknown period: {period}")
+
+class _PeriodBucket:
+    __slots__ = ("bucket_id", "player_stats", "leaderboard")
+
+    def __init__(self, bucket_id):
+        self.bucket_id = bucket_id
+        self.player_stats = {}
+        self.leaderboard = Leaderboard()
+
+class PeriodLeaderboards:
+    """Rolling per-player counters for the current day, week, month and season.
+
+    Each period keeps only its current bucket; a result in a newer bucket
+    replaces it, so old buckets expire as soon as time moves on.
+    """
+
+    def __init__(self):
+        self._buckets = {}  # period -> _PeriodBucket
+
+    def record(self, moment, winners, losers):
+        """Add one game result that finished at `moment` (UTC)"""
+        for period, bucket_of in PERIOD_BUCKETS.items():
+            bucket_id = bucket_of(moment)
+            bucket = self._buckets.get(period)
+            if bucket is None or bucket_id > bucket.bucket_id:
+                bucket = self._buckets[period] = _PeriodBucket(bucket_id)
+            elif bucket_id < bucket.bucket_id:
+                continue  # Belongs to an expired bucket
+
+            for user_id in winners:
+                self._add_result(bucket, user_id, won=True)
+            for user_id in losers:
+                self._add_result(bucket, user_id, won=False)
+
+    def _add_result(self, bucket, user_id, won):
+        stats = bucket.player_stats.get(user_id, PlayerStats()).with_result(won)
+        bucket.player_stats[user_id] = stats
+        bucket.leaderboard.update(user_id, stats)
+
+    def top(self, period, now, limit):
+        """[(user_id, PlayerStats)] for the best players of the current bucket"""
+        if period not in PERIOD_BUCKETS:
+            raise ValueError(f"Unknown period: {period}")
+        bucket = self._buckets.get(period)
+        if bucket is None or bucket.bucket_id != PERIOD_BUCKETS[period](now):
+            return []
+        return [(user_id, bucket.player_stats[user_id]) for user_id in bucket.leaderboard.top(limit)]
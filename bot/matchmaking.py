@@ -1,14 +1,172 @@
 import discord
 import asyncio
 import logging
+import time
 from config import Config
+from bot.fanout import DMFanout, TokenBucket
+from bot.outbox import NotificationOutbox
+from bot.persistence import WriteBehindWriter
+from bot.region_index import LOCATION_IDS_BY_LABEL, RegionIndex, location_mask, mask_locations
+from bot.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
 class MatchmakingManager:
     def __init__(self, bot):
         self.bot = bot
+        self.storage = bot.storage
         self.regional_roles = Config.get_regional_roles()
+        self.region_index = RegionIndex(self.regional_roles)
+        self._load_location_preferences()
+        self.preferences_writer = WriteBehindWriter(
+            self._write_location_preferences,
+            self._snapshot_location_preferences,
+            Config.MATCHMAKING_FLUSH_INTERVAL,
+            name="location preferences"
+        )
+        # DM rate limits apply to the whole bot, so every fan-out shares one bucket
+        self.dm_bucket = TokenBucket(Config.FANOUT_RATE, Config.FANOUT_MAX_RATE, slow_send=Config.FANOUT_SLOW_SEND)
+        self._fanout_tasks = set()
+        # Bounded, expiring memory of who searched and who was DMed recently
+        self.find_cooldowns = TTLCache(Config.FIND_CACHE_SIZE, Config.FIND_COOLDOWN)
+        self.recently_notified = TTLCache(Config.NOTIFIED_CACHE_SIZE, Config.NOTIFY_DEDUP_WINDOW)
+        self._active_waves = {}  # (region, location) -> wave in progress
+        self.dm_closed = self._load_dm_closed()  # member id -> when a DM last failed with Forbidden
+        self.dm_closed_writer = WriteBehindWriter(
+            self._write_dm_closed,
+            self._snapshot_dm_closed,
+            Config.MATCHMAKING_FLUSH_INTERVAL,
+            name="closed DMs"
+        )
+        self.outbox = NotificationOutbox(self.storage, Config.OUTBOX_TTL, Config.OUTBOX_CHECKPOINT_INTERVAL)
+        self._outbox_resumed = False
+        self._job_waves = {}  # outbox job id -> wave being served
+        self._response_events = {}  # outbox job id -> set when someone answers
+    
+    async def resume_outbox(self):
+        """Restart fan-outs that were still queued when the bot last stopped"""
+        if self._outbox_resumed:
+            return
+        self._outbox_resumed = True
+        
+        for job in self.outbox.take_stale():
+            logger.info(f"Dropped stale notification job with {len(job.pending)} pending DMs")
+            await self._send_results(job, None, len(job.pending))
+        
+        for job in list(self.outbox.jobs.values()):
+            guild = self.bot.get_guild(job.payload['guild_id'])
+            if not guild:
+                logger.error(f"Guild {job.payload['guild_id']} not found, dropping notification job")
+                self.outbox.finish(job)
+                continue
+            
+            recipients = []
+            for member_id in list(job.pending):
+                member = guild.get_member(int(member_id))
+                if member:
+                    recipients.append(member)
+                else:
+                    self.outbox.mark_processed(job, member_id, "failed")
+            
+            logger.info(f"Resuming notification job with {len(recipients)} pending DMs")
+            task = asyncio.create_task(self._drain_job(job, guild, recipients))
+            self._fanout_tasks.add(task)
+            task.add_done_callback(self._fanout_tasks.discard)
+    
+    def region_counts(self, guild):
+        """Number of indexed players in each region"""
+        if not self.region_index.ready:
+            self.region_index.build(guild)
+        return self.region_index.counts()
+    
+    async def close(self):
+        """Stop running fan-outs, checkpoint the outbox so they resume on restart and write pending updates"""
+        for task in list(self._fanout_tasks):
+            task.cancel()
+        await asyncio.gather(*self._fanout_tasks, return_exceptions=True)
+        await self.outbox.close()
+        await self.dm_closed_writer.close()
+        await self.preferences_writer.close()
+    
+    def _load_location_preferences(self):
+        """Load each member's preferred locations into the region index"""
+        try:
+            preferences = self.storage.load_collection("location_preferences", {})
+        except Exception as e:
+            logger.error(f"Error loading location preferences: {e}")
+            preferences = {}
+        for member_id, mask in preferences.items():
+            self.region_index.set_preferences(int(member_id), mask)
+    
+    def get_location_preferences(self, member_id):
+        """Location ids a member has opted into"""
+        return mask_locations(self.region_index.preferences.get(member_id, 0))
+    
+    def set_location_preferences(self, member_id, location_ids):
+        """Replace a member's preferred locations and queue them to be saved"""
+        mask = location_mask(location_ids)
+        self.region_index.set_preferences(member_id, mask)
+        self.preferences_writer.mark_dirty([str(member_id)])
+    
+    def _snapshot_location_preferences(self, dirty_ids):
+        # The JSON backend rewrites the whole collection, so every member is included
+        preferences = {str(member_id): mask for member_id, mask in self.region_index.preferences.items()}
+        return preferences, list(dirty_ids)
+    
+    def _write_location_preferences(self, payload):
+        preferences, changed_ids = payload
+        self.storage.save_collection("location_preferences", preferences, changed_ids)
+    
+    def _load_dm_closed(self):
+        """Load members whose DMs were closed on their last attempt"""
+        try:
+            return self.storage.load_collection("dm_closed", {})
+        except Exception as e:
+            logger.error(f"Error loading closed DMs: {e}")
+            return {}
+    
+    def _save_dm_closed(self, changed_ids):
+        """Queue changed closed-DM entries to be written to storage"""
+        self.dm_closed_writer.mark_dirty(changed_ids)
+    
+    def _snapshot_dm_closed(self, dirty_ids):
+        # The JSON backend rewrites the whole collection, so every entry is included
+        return dict(self.dm_closed), list(dirty_ids)
+    
+    def _write_dm_closed(self, payload):
+        data, changed_ids = payload
+        self.storage.save_collection("dm_closed", data, changed_ids)
+    
+    def _skip_dm_closed(self, members):
+        """Drop members known to have DMs closed, returning the rest and the skipped count.
+        
+        Entries older than DM_CLOSED_RETRY are forgotten so those members get probed again.
+        """
+        now = time.time()
+        reachable = []
+        expired = []
+        for member in members:
+            closed_at = self.dm_closed.get(str(member.id))
+            if closed_at is not None and now - closed_at < Config.DM_CLOSED_RETRY:
+                continue
+            if closed_at is not None:
+                expired.append(str(member.id))
+                del self.dm_closed[str(member.id)]
+            reachable.append(member)
+        
+        if expired:
+            self._save_dm_closed(expired)
+        return reachable, len(members) - len(reachable)
+    
+    def _remember_dm_closed(self, members):
+        """Record members whose DMs just failed with Forbidden"""
+        if not members:
+            return
+        now = time.time()
+        changed_ids = [str(member.id) for member in members]
+        for member_id in changed_ids:
+            self.dm_closed[member_id] = now
+        self._save_dm_closed(changed_ids)
     
     async def handle_region_find(self, interaction, region, location=None):
         """Handle regional player finding with optional location"""
@@ -30,41 +188,113 @@ class MatchmakingManager:
                 )
                 return
             
-            # Get all members with this role
-            members_with_role = [member for member in role.members if not member.bot]
+            # Repeated clicks join the wave already notifying this region
+            requester = interaction.user
+            region_emoji = {"east": "🌅", "central": "🌇", "west": "🌄"}
+            location_text = f" ({location})" if location else ""
+            wave = self._active_waves.get((region, location))
+            if wave is not None:
+                if all(user.id != requester.id for user in wave['requesters']):
+                    wave['requesters'].append(requester)
+                    # Record them on the job too so the results reach them after a restart
+                    job = self.outbox.jobs.get(wave.get('job_id'))
+                    if job and requester.id not in job.payload['requester_ids']:
+                        job.payload['requester_ids'].append(requester.id)
+                        self.outbox.checkpoint(job)
+                await interaction.response.send_message(
+                    f"🔁 Players in the **{region.title()}{location_text}** region are already being notified. "
+                    f"Your request was merged and you'll get the results too.",
+                    ephemeral=True
+                )
+                return
             
-            if not members_with_role:
+            cooldown = self.find_cooldowns.remaining(requester.id)
+            if cooldown:
+                await interaction.response.send_message(
+                    f"⏳ You can look for players again in {cooldown:.0f}s.",
+                    ephemeral=True
+                )
+                return
+            
+            # Get all members with this role from the maintained index
+            if not self.region_index.ready:
+                self.region_index.build(interaction.guild)
+            member_ids = self.region_index.member_ids(region)
+            
+            # Only DM players who opted into this location, unless too few did
+            location_id = LOCATION_IDS_BY_LABEL.get(location)
+            targeted = False
+            if location_id:
+                location_ids = self.region_index.location_member_ids(region, location_id)
+                location_ids = location_ids - {requester.id}
+                if len(location_ids) >= Config.LOCATION_MIN_TARGETS:
+                    member_ids = location_ids
+                    targeted = True
+            
+            if not member_ids:
                 await interaction.response.send_message(
                     f"❌ No players found in the {region.title()} region.",
                     ephemeral=True
                 )
                 return
             
-            # Send confirmation to the user
-            region_emoji = {"east": "🌅", "central": "🌇", "west": "🌄"}
-            location_text = f" ({location})" if location else ""
-            try:
+            # Skip players with DMs closed and those who already got a find DM within the dedup window
+            reachable, known_closed = self._skip_dm_closed([
+                member for member in map(interaction.guild.get_member, member_ids)
+                if member and member.id != requester.id
+            ])
+            recipients = [member for member in reachable if member.id not in self.recently_notified]
+            suppressed = len(reachable) - len(recipients)
+            window_minutes = Config.NOTIFY_DEDUP_WINDOW / 60
+            
+            if not recipients:
                 await interaction.response.send_message(
-                    f"{region_emoji.get(region, '🌍')} Looking for players in the **{region.title()}{location_text}** region...\n"
-                    f"Sending DMs to {len(members_with_role)} players!",
+                    f"📭 No one in the {region.title()} region can be notified right now "
+                    f"({suppressed} notified in the last {window_minutes:.0f} minutes, {known_closed} with DMs closed).",
                     ephemeral=True
                 )
+                return
+            
+            self.find_cooldowns.set(requester.id)
+            
+            # The closest ratings hear first, so early waves reach the best matches
+            by_id = {member.id: member for member in recipients}
+            ordered_ids = self.bot.stats_manager.order_by_rating(requester.id, list(by_id))
+            recipients = [by_id[member_id] for member_id in ordered_ids]
+            
+            # Send confirmation to the user
+            message = (
+                f"{region_emoji.get(region, '🌍')} Looking for players in the **{region.title()}{location_text}** region...\n"
+                f"Notifying up to {len(recipients)} players until {Config.FIND_PLAYERS_NEEDED} say they're in!"
+            )
+            if targeted:
+                message += f"\nOnly players who prefer {location} are being notified."
+            elif location_id:
+                message += f"\nToo few players prefer {location}, so the whole region is being notified."
+            if suppressed:
+                message += f"\n{suppressed} players were skipped (already notified in the last {window_minutes:.0f} minutes)."
+            if known_closed:
+                message += f"\n{known_closed} players were skipped (DMs closed)."
+            try:
+                await interaction.response.send_message(message, ephemeral=True)
             except discord.errors.NotFound:
                 # Interaction expired, try followup
-                await interaction.followup.send(
-                    f"{region_emoji.get(region, '🌍')} Looking for players in the **{region.title()}{location_text}** region...\n"
-                    f"Sending DMs to {len(members_with_role)} players!",
-                    ephemeral=True
-                )
+                await interaction.followup.send(message, ephemeral=True)
             
-            # Send DMs to all members with the role
-            await self._send_region_notifications(
-                interaction.user, 
-                members_with_role, 
+            # Send DMs in the background and stream progress into the reply
+            wave = {'requesters': [requester], 'suppressed': suppressed, 'known_closed': known_closed}
+            self._active_waves[(region, location)] = wave
+            task = asyncio.create_task(self._send_region_notifications(
+                requester, 
+                recipients, 
                 region,
                 interaction.guild,
-                location
-            )
+                location,
+                interaction,
+                wave
+            ))
+            self._fanout_tasks.add(task)
+            task.add_done_callback(self._fanout_tasks.discard)
             
         except Exception as e:
             logger.error(f"Error in region find: {e}")
@@ -73,8 +303,43 @@ class MatchmakingManager:
                 ephemeral=True
             )
     
-    async def _send_region_notifications(self, requester, members, region, guild, location=None):
-        """Send DM notifications to regional players"""
+    def _progress_reporter(self, interaction, job, wave):
+        """Edit the requester's ephemeral reply with fan-out progress"""
+        if interaction is None:
+            return None
+        
+        payload = job.payload
+        location_text = f" ({payload['location']})" if payload['location'] else ""
+        
+        async def report(fanout=None, finished=False):
+            elapsed = time.time() - job.created_at
+            # Interaction tokens expire after 15 minutes
+            if elapsed > 14 * 60:
+                return
+            counts = job.counts
+            processed = counts['sent'] + counts['forbidden'] + counts['failed']
+            status = "✅ Finished notifying" if finished else "📨 Notifying"
+            rate = processed / elapsed if elapsed else 0.0
+            content = (
+                f"{status} players in the **{payload['region'].title()}{location_text}** region: "
+                f"**{counts['sent']}** of {processed + len(job.pending)} reached, "
+                f"**{len(job.responses)}**/{payload['target']} in"
+            )
+            if counts['forbidden'] or counts['failed']:
+                content += f", {counts['forbidden'] + counts['failed']} unreachable"
+            if payload['suppressed']:
+                content += f", {payload['suppressed']} skipped as recently notified"
+            if payload['known_closed']:
+                content += f", {payload['known_closed']} skipped with DMs closed"
+            if len(wave['requesters']) > 1:
+                content += f", {len(wave['requesters']) - 1} duplicate requests merged"
+            content += f" ({elapsed:.0f}s, {rate:.1f}/s)"
+            await interaction.edit_original_response(content=content)
+        
+        return report
+    
+    async def _send_region_notifications(self, requester, members, region, guild, location=None, interaction=None, wave=None):
+        """Queue DM notifications to regional players and deliver them"""
         region_emoji = {"east": "🌅", "central": "🌇", "west": "🌄"}
         emoji = region_emoji.get(region, "🌍")
         
@@ -100,43 +365,202 @@ class MatchmakingManager:
         
         embed.add_field(
             name="💬 Join the Action",
-            value=f"Head over to {guild.name} to join the game!",
+            value=f"Press **I'm in** to let them know, then head over to {guild.name} to join the game!",
             inline=False
         )
         
-        # Send DMs with delays to avoid rate limits
-        successful_dms = 0
-        failed_dms = 0
+        if wave is None:
+            wave = {'requesters': [requester], 'suppressed': 0, 'known_closed': 0}
+        recipients = [member for member in members if member.id != requester.id]
         
-        for member in members:
-            if member.id == requester.id:
-                continue  # Don't DM the requester
+        # Queue the whole fan-out first so a restart can finish it
+        job = self.outbox.enqueue({
+            'guild_id': guild.id,
+            'requester_ids': [user.id for user in wave['requesters']],
+            'region': region,
+            'location': location,
+            'embed': embed.to_dict(),
+            'target': Config.FIND_PLAYERS_NEEDED,
+            'suppressed': wave['suppressed'],
+            'known_closed': wave['known_closed']
+        }, [str(member.id) for member in recipients])
+        
+        await self._drain_job(job, guild, recipients, interaction, wave)
+    
+    async def _drain_job(self, job, guild, recipients, interaction=None, wave=None):
+        """Deliver an outbox job in waves until enough players are in or the deadline passes"""
+        payload = job.payload
+        payload.setdefault('target', Config.FIND_PLAYERS_NEEDED)
+        region = payload['region']
+        location = payload['location']
+        if wave is None:
+            # Resumed after a restart: merge later clicks into this job again
+            wave = {'requesters': [], 'suppressed': payload['suppressed'], 'known_closed': payload['known_closed']}
+            self._active_waves.setdefault((region, location), wave)
+        wave['job_id'] = job.id
+        self._job_waves[job.id] = wave
+        responded = self._response_events.setdefault(job.id, asyncio.Event())
+        position = 0
+        forbidden_members = []
+        report = None
+        cancelled = False
+        
+        try:
+            # The embed and its "I'm in" button are built once and shared by every send
+            embed = discord.Embed.from_dict(payload['embed'])
+            view = discord.ui.View(timeout=None)
+            view.add_item(FindJoinButton(job.id))
             
-            try:
-                await member.send(embed=embed)
-                successful_dms += 1
-                await asyncio.sleep(1)  # Rate limit protection
+            async def send(member):
+                await member.send(embed=embed, view=view)
+            
+            def target_reached():
+                return len(job.responses) >= payload['target']
+            
+            def processed(member, outcome):
+                self.outbox.mark_processed(job, str(member.id), outcome)
+                if outcome == "sent":
+                    self.recently_notified.set(member.id)
+                if target_reached() or job.is_stale(self.outbox.ttl):
+                    fanout.stop()
+            
+            report = self._progress_reporter(interaction, job, wave)
+            deadline = job.created_at + Config.FIND_RESPONSE_DEADLINE
+            wave_size = Config.FIND_WAVE_SIZE or len(recipients)
+            
+            while not target_reached() and time.time() < deadline and not job.is_stale(self.outbox.ttl):
+                # Next wave: the first recipients still pending, in their original order
+                batch = []
+                while position < len(recipients) and len(batch) < wave_size:
+                    if str(recipients[position].id) in job.pending:
+                        batch.append(recipients[position])
+                    position += 1
                 
-            except discord.Forbidden:
-                # User has DMs disabled
-                failed_dms += 1
-                continue
+                if batch:
+                    fanout = DMFanout(
+                        batch,
+                        send,
+                        self.dm_bucket,
+                        Config.FANOUT_CONCURRENCY,
+                        on_progress=report,
+                        progress_interval=Config.FANOUT_PROGRESS_INTERVAL,
+                        on_processed=processed
+                    )
+                    await fanout.run()
+                    forbidden_members.extend(fanout.forbidden_members)
+                    wave_end = min(deadline, time.time() + Config.FIND_WAVE_INTERVAL)
+                else:
+                    # Everyone has been notified; keep collecting answers until the deadline
+                    wave_end = deadline
+                
+                # Give this wave time to answer before widening the search
+                while not target_reached() and time.time() < wave_end:
+                    responded.clear()
+                    try:
+                        await asyncio.wait_for(responded.wait(), wave_end - time.time())
+                    except asyncio.TimeoutError:
+                        pass
+        except asyncio.CancelledError:
+            # Shutdown: leave the job in the outbox so it resumes on restart
+            cancelled = True
+            raise
+        except Exception as e:
+            logger.error(f"Error delivering notification job {job.id}: {e}")
+        finally:
+            if self._active_waves.get((region, location)) is wave:
+                del self._active_waves[(region, location)]
+            self._remember_dm_closed(forbidden_members)
+            self._job_waves.pop(job.id, None)
+            self._response_events.pop(job.id, None)
+            if not cancelled:
+                self.outbox.finish(job)
+        
+        unsent = len(job.pending)
+        if report:
+            # The reply may be dismissed or its token expired; the summary DM still goes out
+            try:
+                await report(finished=True)
             except Exception as e:
-                logger.error(f"Error sending DM to {member}: {e}")
-                failed_dms += 1
-                continue
+                logger.error(f"Error reporting fan-out progress: {e}")
         
         # Log the results
-        logger.info(f"Region find notification: {successful_dms} successful, {failed_dms} failed DMs")
+        logger.info(
+            f"Region find notification: {job.counts['sent']} successful, "
+            f"{job.counts['forbidden'] + job.counts['failed']} failed, {unsent} unsent DMs, "
+            f"{len(job.responses)}/{payload['target']} players in"
+        )
+        
+        await self._send_results(job, wave, unsent)
+    
+    async def handle_find_response(self, interaction, job_id):
+        """Record a player answering "I'm in" to a find notification"""
+        job = self.outbox.jobs.get(job_id)
+        if job is None:
+            await interaction.response.send_message("⌛ This search has already ended.")
+            return
+        
+        user = interaction.user
+        target = job.payload.get('target', Config.FIND_PLAYERS_NEEDED)
+        if user.id in job.responses:
+            await interaction.response.send_message("✅ You're already in for this game!")
+            return
+        if len(job.responses) >= target:
+            await interaction.response.send_message("🙌 Thanks, but enough players have already joined this one.")
+            return
+        
+        self.outbox.record_response(job, user.id)
+        event = self._response_events.get(job_id)
+        if event:
+            event.set()
+        
+        guild = self.bot.get_guild(job.payload['guild_id'])
+        await interaction.response.send_message(
+            f"✅ You're in! The requester has been told. Head over to {guild.name if guild else 'the server'} to join."
+        )
+        
+        try:
+            for requester in await self._requesters(job, self._job_waves.get(job_id)):
+                await requester.send(
+                    f"✋ **{user.display_name}** is in! ({len(job.responses)}/{target})"
+                )
+        except Exception as e:
+            logger.error(f"Error telling requester about response: {e}")
+    
+    async def _requesters(self, job, wave):
+        """Everyone whose request is served by a job, including merged ones"""
+        requesters = list(wave['requesters']) if wave else []
+        # Requesters from before a restart are looked up again by id
+        known_ids = {user.id for user in requesters}
+        for user_id in job.payload['requester_ids']:
+            if user_id not in known_ids:
+                requesters.append(self.bot.get_user(user_id) or await self.bot.fetch_user(user_id))
+        return requesters
+    
+    async def _send_results(self, job, wave, unsent=0):
+        """Send the notification summary to everyone who requested this fan-out"""
+        payload = job.payload
+        successful_dms = job.counts['sent']
+        failed_dms = job.counts['forbidden'] + job.counts['failed']
+        window_minutes = Config.NOTIFY_DEDUP_WINDOW / 60
+        target = payload.get('target', Config.FIND_PLAYERS_NEEDED)
         
-        # Optionally send a follow-up to the requester with results
         try:
             result_embed = discord.Embed(
                 title="📬 Notification Results",
-                description=f"Successfully notified **{successful_dms}** players in the {region.title()} region!",
-                color=discord.Color.green()
+                description=(
+                    f"Successfully notified **{successful_dms}** players in the {payload['region'].title()} region!\n"
+                    f"**{len(job.responses)}**/{target} players are in."
+                ),
+                color=discord.Color.green() if len(job.responses) >= target else discord.Color.orange()
             )
             
+            if job.responses:
+                result_embed.add_field(
+                    name="✋ Players In",
+                    value=", ".join(f"<@{member_id}>" for member_id in job.responses),
+                    inline=False
+                )
+            
             if failed_dms > 0:
                 result_embed.add_field(
                     name="ℹ️ Note",
@@ -144,7 +568,65 @@ class MatchmakingManager:
                     inline=False
                 )
             
-            await requester.send(embed=result_embed)
+            if payload['known_closed']:
+                result_embed.add_field(
+                    name="📪 Known Closed",
+                    value=f"{payload['known_closed']} players were skipped because their DMs were closed last time",
+                    inline=False
+                )
+            
+            if payload['suppressed']:
+                result_embed.add_field(
+                    name="🔕 Skipped",
+                    value=f"{payload['suppressed']} players were already notified in the last {window_minutes:.0f} minutes",
+                    inline=False
+                )
+            
+            if unsent and len(job.responses) >= target:
+                result_embed.add_field(
+                    name="🎯 Target Reached",
+                    value=f"{unsent} players didn't need to be notified",
+                    inline=False
+                )
+            elif unsent:
+                result_embed.add_field(
+                    name="⌛ Expired",
+                    value=f"{unsent} players weren't notified before the request went stale",
+                    inline=False
+                )
+            
+            requesters = await self._requesters(job, wave)
+            if len(requesters) > 1:
+                result_embed.add_field(
+                    name="🔁 Merged Requests",
+                    value=f"{len(requesters) - 1} other requests for this region joined this search",
+                    inline=False
+                )
+            
+            # Everyone whose request was merged into this wave gets the results
+            for user in requesters:
+                await user.send(embed=result_embed)
             
         except Exception as e:
             logger.error(f"Error sending results to requester: {e}")
+
+class FindJoinButton(discord.ui.DynamicItem[discord.ui.Button], template=r"find_join:(?P<job_id>[0-9a-f]+)"):
+    """"I'm in" button on find DMs, routed by outbox job id so it keeps working after restarts"""
+    
+    def __init__(self, job_id):
+        super().__init__(
+            discord.ui.Button(
+                label="I'm in",
+                style=discord.ButtonStyle.success,
+                emoji="✋",
+                custom_id=f"find_join:{job_id}"
+            )
+        )
+        self.job_id = job_id
+    
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(match["job_id"])
+    
+    async def callback(self, interaction: discord.Interaction):
+        await interaction.client.matchmaking_manager.handle_find_response(interaction, self.job_id)
@@ -1,6 +1,9 @@
 import discord
 import logging
+from datetime import datetime, timezone
 from config import Config
+from bot.leaderboard import PERIOD_LABELS
+from bot.region_index import LOCATIONS
 
 logger = logging.getLogger(__name__)
 
@@ -8,8 +11,8 @@ class MenuManager:
     def __init__(self, bot):
         self.bot = bot
     
-    async def send_drafts_menu(self, channel):
-        """Send the main drafts menu"""
+    def build_drafts_menu(self):
+        """Build the main drafts menu embed and view"""
         embed = discord.Embed(
             title="🎮 Team Drafts",
             description="Create balanced teams for your games!",
@@ -29,10 +32,15 @@ class MenuManager:
         )
         
         view = DraftsMenuView()
+        return embed, view
+    
+    async def send_drafts_menu(self, channel):
+        """Send the main drafts menu"""
+        embed, view = self.build_drafts_menu()
         await channel.send(embed=embed, view=view)
     
-    async def send_find_menu(self, channel):
-        """Send the regional find menu"""
+    def build_find_menu(self):
+        """Build the regional find menu embed and view"""
         embed = discord.Embed(
             title="🌍 Find Players",
             description="Search for players in your region!",
@@ -57,11 +65,22 @@ class MenuManager:
             inline=True
         )
         
+        embed.add_field(
+            name="📍 My Locations",
+            value="Choose the locations you want to hear about",
+            inline=False
+        )
+        
         view = FindMenuView()
+        return embed, view
+    
+    async def send_find_menu(self, channel):
+        """Send the regional find menu"""
+        embed, view = self.build_find_menu()
         await channel.send(embed=embed, view=view)
     
-    async def send_stats_menu(self, channel):
-        """Send the stats menu"""
+    def build_stats_menu(self):
+        """Build the stats menu embed and view"""
         embed = discord.Embed(
             title="📊 Player Statistics",
             description="Track your wins, losses, and performance!",
@@ -86,7 +105,24 @@ class MenuManager:
             inline=True
         )
         
+        embed.add_field(
+            name="🕹️ My Recent Games",
+            value="Browse your game history",
+            inline=True
+        )
+        
+        embed.add_field(
+            name="📅 Periods",
+            value="Today, this week, this month or this season",
+            inline=True
+        )
+        
         view = StatsMenuView()
+        return embed, view
+    
+    async def send_stats_menu(self, channel):
+        """Send the stats menu"""
+        embed, view = self.build_stats_menu()
         await channel.send(embed=embed, view=view)
 
 class DraftsMenuView(discord.ui.View):
@@ -186,6 +222,20 @@ class FindMenuView(discord.ui.View):
             return
         await self._show_location_menu(interaction, "west")
     
+    @discord.ui.button(label="My Locations", style=discord.ButtonStyle.secondary, emoji="📍", custom_id="find_preferences", row=1)
+    async def find_preferences(self, interaction: discord.Interaction, button: discord.ui.Button):
+        preferred = interaction.client.matchmaking_manager.get_location_preferences(interaction.user.id)
+        embed = discord.Embed(
+            title="📍 Preferred Locations",
+            description="Pick the locations you play on. Location searches will only DM players who prefer that location.",
+            color=discord.Color.blue()
+        )
+        await interaction.response.send_message(
+            embed=embed,
+            view=LocationPreferencesView(preferred),
+            ephemeral=True
+        )
+    
     async def _show_location_menu(self, interaction: discord.Interaction, region: str):
         """Show location-specific menu for region"""
         region_emoji = {"east": "🌅", "central": "🌇", "west": "🌄"}
@@ -196,6 +246,17 @@ class FindMenuView(discord.ui.View):
             color=discord.Color.blue()
         )
         
+        matchmaking = interaction.client.matchmaking_manager
+        counts = matchmaking.region_counts(interaction.guild)
+        location_counts = matchmaking.region_index.location_counts(region)
+        for location_id, label, emoji in LOCATIONS.get(region, []):
+            embed.add_field(
+                name=f"{emoji} {label}",
+                value=f"{location_counts.get(location_id, 0)} players prefer this location",
+                inline=True
+            )
+        embed.set_footer(text=f"{counts.get(region, 0)} players in this region")
+        
         view = LocationMenuView(region)
         try:
             await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
@@ -207,15 +268,47 @@ class LocationMenuView(discord.ui.View):
         super().__init__(timeout=300)
         self.region = region
         
-        if region == "east":
-            self.add_item(LocationButton("Ashburn", "ashburn", "🏢"))
-            self.add_item(LocationButton("Ohio", "ohio", "🌽"))
-        elif region == "central":
-            self.add_item(LocationButton("Iowa", "iowa", "🌾"))
-            self.add_item(LocationButton("San Antonio", "san_antonio", "🌵"))
-        elif region == "west":
-            self.add_item(LocationButton("San Francisco", "san_francisco", "🌉"))
-            self.add_item(LocationButton("Quincy", "quincy", "🏔️"))
+        for location_id, label, emoji in LOCATIONS.get(region, []):
+            self.add_item(LocationButton(label, location_id, emoji))
+
+class LocationPreferencesView(discord.ui.View):
+    def __init__(self, preferred):
+        super().__init__(timeout=300)
+        self.add_item(LocationPreferencesSelect(preferred))
+
+class LocationPreferencesSelect(discord.ui.Select):
+    """Opt into find notifications for specific locations"""
+    
+    def __init__(self, preferred):
+        options = [
+            discord.SelectOption(
+                label=label,
+                value=location_id,
+                emoji=emoji,
+                description=f"{region.title()} region",
+                default=location_id in preferred
+            )
+            for region, locations in LOCATIONS.items()
+            for location_id, label, emoji in locations
+        ]
+        super().__init__(
+            placeholder="Choose your preferred locations...",
+            min_values=0,
+            max_values=len(options),
+            options=options
+        )
+    
+    async def callback(self, interaction: discord.Interaction):
+        interaction.client.matchmaking_manager.set_location_preferences(interaction.user.id, self.values)
+        if self.values:
+            labels = [option.label for option in self.options if option.value in self.values]
+            content = f"✅ Preferred locations saved: {', '.join(labels)}"
+        else:
+            content = (
+                "✅ Location preferences cleared. You'll still be notified for region-wide finds, "
+                "and for location finds when too few players prefer that location."
+            )
+        await interaction.response.edit_message(content=content, embed=None, view=None)
 
 class LocationButton(discord.ui.Button):
     def __init__(self, label, location_id, emoji):
@@ -260,13 +353,27 @@ class StatsMenuView(discord.ui.View):
             color=discord.Color.blue()
         )
         
-        embed.add_field(name="Games Played", value=str(stats['games_played']), inline=True)
-        embed.add_field(name="Wins", value=str(stats['wins']), inline=True)
-        embed.add_field(name="Losses", value=str(stats['losses']), inline=True)
+        embed.add_field(name="Games Played", value=str(stats.games_played), inline=True)
+        embed.add_field(name="Wins", value=str(stats.wins), inline=True)
+        embed.add_field(name="Losses", value=str(stats.losses), inline=True)
         
-        if stats['games_played'] > 0:
-            win_rate = (stats['wins'] / stats['games_played']) * 100
+        if stats.games_played > 0:
+            win_rate = stats.win_rate * 100
             embed.add_field(name="Win Rate", value=f"{win_rate:.1f}%", inline=True)
+            embed.add_field(name="Rating", value=f"{stats.rating:.0f}", inline=True)
+        
+        stats_manager = interaction.client.stats_manager
+        rank = stats_manager.get_player_rank(interaction.user.id)
+        if rank:
+            embed.add_field(name="Rank", value=f"#{rank[0]} of {rank[1]}", inline=True)
+            
+            nearby = ""
+            for position, user_id, player_stats in stats_manager.get_players_around(interaction.user.id):
+                user = interaction.client.get_user(user_id)
+                name = user.display_name if user else f"User {user_id}"
+                marker = "➡️ " if user_id == interaction.user.id else ""
+                nearby += f"{marker}{position}. **{name}** - {player_stats.wins}W/{player_stats.losses}L\n"
+            embed.add_field(name="Around You", value=nearby, inline=False)
         
         await interaction.response.send_message(embed=embed, ephemeral=True)
     
@@ -280,6 +387,89 @@ class StatsMenuView(discord.ui.View):
         """Show modal to look up another player's stats"""
         modal = PlayerStatsModal()
         await interaction.response.send_modal(modal)
+    
+    @discord.ui.select(
+        placeholder="📅 View a leaderboard period...",
+        custom_id="stats_leaderboard_period",
+        options=[
+            discord.SelectOption(label=label, value=period)
+            for period, label in PERIOD_LABELS.items()
+        ],
+        row=1
+    )
+    async def leaderboard_period(self, interaction: discord.Interaction, select: discord.ui.Select):
+        """Show the leaderboard for the selected period"""
+        embed = interaction.client.stats_manager.build_leaderboard_embed(select.values[0])
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    @discord.ui.button(label="My Recent Games", style=discord.ButtonStyle.secondary, emoji="🕹️", custom_id="stats_recent_games")
+    async def recent_games(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """Show the user's game history, newest first"""
+        view = RecentGamesView(interaction.user)
+        await interaction.response.send_message(
+            embed=view.build_embed(interaction.client.stats_manager),
+            view=view,
+            ephemeral=True
+        )
+
+class RecentGamesView(discord.ui.View):
+    PAGE_SIZE = 5
+    
+    def __init__(self, user):
+        super().__init__(timeout=300)
+        self.user = user
+        self.page = 0
+    
+    def build_embed(self, stats_manager):
+        """Build the embed for the current page and update button states"""
+        total = stats_manager.get_player_game_count(self.user.id)
+        pages = max((total + self.PAGE_SIZE - 1) // self.PAGE_SIZE, 1)
+        self.page = min(self.page, pages - 1)
+        
+        embed = discord.Embed(
+            title=f"🕹️ {self.user.display_name}'s Recent Games",
+            color=discord.Color.blue()
+        )
+        
+        games = stats_manager.get_player_games(self.user.id, self.page * self.PAGE_SIZE, self.PAGE_SIZE)
+        if not games:
+            embed.description = "No games played yet!"
+        
+        for game in games:
+            team = 1 if any(player["id"] == self.user.id for player in game["team1"]) else 2
+            teammates = game["team1"] if team == 1 else game["team2"]
+            opponents = game["team2"] if team == 1 else game["team1"]
+            
+            if game.get("winner"):
+                result = "✅ Win" if game["winner"] == team else "❌ Loss"
+            elif game.get("status") == "cancelled":
+                result = "🚫 Cancelled"
+            else:
+                result = "⏳ In Progress"
+            
+            played_at = int(datetime.fromisoformat(game["timestamp"]).replace(tzinfo=timezone.utc).timestamp())
+            embed.add_field(
+                name=f"Game #{game['game_number']} - {result}",
+                value=f"**With:** {', '.join(player['name'] for player in teammates)}\n"
+                      f"**Against:** {', '.join(player['name'] for player in opponents)}\n"
+                      f"<t:{played_at}:R>",
+                inline=False
+            )
+        
+        embed.set_footer(text=f"Page {self.page + 1}/{pages} • {total} games")
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = self.page >= pages - 1
+        return embed
+    
+    @discord.ui.button(label="Newer", style=discord.ButtonStyle.secondary, emoji="◀️")
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page = max(self.page - 1, 0)
+        await interaction.response.edit_message(embed=self.build_embed(interaction.client.stats_manager), view=self)
+    
+    @discord.ui.button(label="Older", style=discord.ButtonStyle.secondary, emoji="▶️")
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page += 1
+        await interaction.response.edit_message(embed=self.build_embed(interaction.client.stats_manager), view=self)
 
 class PlayerStatsModal(discord.ui.Modal, title="Player Stats Lookup"):
     def __init__(self):
@@ -320,12 +510,17 @@ class PlayerStatsModal(discord.ui.Modal, title="Player Stats Lookup"):
             color=discord.Color.blue()
         )
         
-        embed.add_field(name="Games Played", value=str(stats['games_played']), inline=True)
-        embed.add_field(name="Wins", value=str(stats['wins']), inline=True)
-        embed.add_field(name="Losses", value=str(stats['losses']), inline=True)
+        embed.add_field(name="Games Played", value=str(stats.games_played), inline=True)
+        embed.add_field(name="Wins", value=str(stats.wins), inline=True)
+        embed.add_field(name="Losses", value=str(stats.losses), inline=True)
         
-        if stats['games_played'] > 0:
-            win_rate = (stats['wins'] / stats['games_played']) * 100
+        if stats.games_played > 0:
+            win_rate = stats.win_rate * 100
             embed.add_field(name="Win Rate", value=f"{win_rate:.1f}%", inline=True)
+            embed.add_field(name="Rating", value=f"{stats.rating:.0f}", inline=True)
+        
+        rank = interaction.client.stats_manager.get_player_rank(target_user.id)
+        if rank:
+            embed.add_field(name="Rank", value=f"#{rank[0]} of {rank[1]}", inline=True)
         
         await interaction.response.send_message(embed=embed, ephemeral=True)
\ No newline at end of file
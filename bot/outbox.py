@@ -0,0 +1,114 @@
+import logging
+import time
+import uuid
+from bot.persistence import WriteBehindWriter
+
+logger = logging.getLogger(__name__)
+
+class OutboxJob:
+    """A queued fan-out: the message, who asked for it and who still needs it"""
+
+    def __init__(self, job_id, created_at, payload, pending, counts=None, responses=None):
+        self.id = job_id
+        self.created_at = created_at  # Wall clock, so age survives restarts
+        self.payload = payload
+        self.pending = dict.fromkeys(pending)  # Member ids in delivery order
+        self.counts = counts or {"sent": 0, "forbidden": 0, "failed": 0}
+        self.responses = responses or []  # Member ids who answered "I'm in"
+
+    def is_stale(self, ttl):
+        return time.time() - self.created_at > ttl
+
+    def to_dict(self):
+        return {
+            "created_at": self.created_at,
+            "payload": self.payload,
+            "pending": list(self.pending),
+            "counts": self.counts,
+            "responses": self.responses
+        }
+
+    @classmethod
+    def from_dict(cls, job_id, data):
+        return cls(
+            job_id,
+            data["created_at"],
+            data["payload"],
+            data["pending"],
+            data.get("counts"),
+            data.get("responses")
+        )
+
+class NotificationOutbox:
+    """Persistent queue of DM fan-outs so a restart can pick up where it stopped.
+
+    Progress is checkpointed through a write-behind writer, so a burst of
+    deliveries costs one storage write per interval rather than one per DM.
+    """
+
+    COLLECTION = "notification_outbox"
+
+    def __init__(self, storage, ttl, checkpoint_interval):
+        self.storage = storage
+        self.ttl = ttl
+        self.jobs = self._load()
+        self.writer = WriteBehindWriter(
+            self._write,
+            self._snapshot,
+            checkpoint_interval,
+            name="notification outbox"
+        )
+
+    def _load(self):
+        try:
+            data = self.storage.load_collection(self.COLLECTION, {})
+            return {job_id: OutboxJob.from_dict(job_id, job) for job_id, job in data.items()}
+        except Exception as e:
+            logger.error(f"Error loading notification outbox: {e}")
+            return {}
+
+    def _snapshot(self, dirty_ids):
+        # The JSON backend rewrites the whole collection, so every job is included
+        return {job_id: job.to_dict() for job_id, job in self.jobs.items()}, list(dirty_ids)
+
+    def _write(self, payload):
+        data, changed_ids = payload
+        self.storage.save_collection(self.COLLECTION, data, changed_ids)
+
+    def enqueue(self, payload, member_ids):
+        """Queue a message for the given members and return its job"""
+        job = OutboxJob(uuid.uuid4().hex, time.time(), payload, member_ids)
+        self.jobs[job.id] = job
+        self.writer.mark_dirty([job.id])
+        return job
+
+    def mark_processed(self, job, member_id, outcome):
+        """Record a delivery outcome ('sent', 'forbidden' or 'failed')"""
+        job.pending.pop(member_id, None)
+        job.counts[outcome] += 1
+        self.writer.mark_dirty([job.id])
+
+    def record_response(self, job, member_id):
+        """Record a member answering the notification"""
+        job.responses.append(member_id)
+        self.writer.mark_dirty([job.id])
+
+    def checkpoint(self, job):
+        """Save changes made to a job's payload"""
+        self.writer.mark_dirty([job.id])
+
+    def finish(self, job):
+        """Remove a job that has been fully delivered or has expired"""
+        self.jobs.pop(job.id, None)
+        self.writer.mark_dirty([job.id])
+
+    def take_stale(self):
+        """Remove and return jobs too old to be worth delivering"""
+        stale = [job for job in self.jobs.values() if job.is_stale(self.ttl)]
+        for job in stale:
+            self.finish(job)
+        return stale
+
+    async def close(self):
+        """Write the latest checkpoint before shutdown"""
+        await self.writer.close()
@@ -0,0 +1,114 @@
+import asyncio
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+def write_json_atomic(path, data):
+    """Atomically replace a JSON file so a crash never leaves it half written"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+class WriteBehindWriter:
+    """Coalesces updates to stored records and writes them off the event loop"""
+
+    def __init__(self, write, snapshot, interval, name="data"):
+        self.write = write  # Called in a worker thread with the snapshot
+        self.snapshot = snapshot  # Called on the loop with the dirty keys
+        self.interval = interval
+        self.name = name
+        self._dirty = set()
+        self._flush_task = None
+        self._lock = asyncio.Lock()
+
+        # Flush metrics
+        self.flush_count = 0
+        self.last_batch_size = 0
+        self.last_flush_latency = 0.0
+
+    @property
+    def pending(self):
+        """Number of records with updates not yet written to disk"""
+        return len(self._dirty)
+
+    def mark_dirty(self, keys):
+        """Record pending updates and schedule a flush if none is queued"""
+        self._dirty.update(keys)
+        if self._flush_task and not self._flush_task.done():
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (offline tooling) - write straight away
+            self.flush_sync()
+            return
+
+        self._flush_task = loop.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self):
+        """Wait for more updates to accumulate, then flush them together.
+
+        Keeps going while updates arrived during a write or a failed write
+        put its batch back, since mark_dirty only schedules when idle.
+        """
+        while self._dirty:
+            await asyncio.sleep(self.interval)
+            # Shielded so close() cancelling the wait never interrupts a write
+            await asyncio.shield(self.flush())
+
+    async def flush(self):
+        """Write the document if anything changed since the last flush"""
+        async with self._lock:
+            if not self._dirty:
+                return
+
+            batch = self._dirty
+            self._dirty = set()
+            data = self.snapshot(batch)
+
+            start = time.perf_counter()
+            try:
+                await asyncio.to_thread(self.write, data)
+            except Exception as e:
+                # Keep the updates pending so the next flush retries them
+                self._dirty |= batch
+                logger.error(f"Error flushing {self.name}: {e}")
+                return
+
+            self._record_flush(len(batch), time.perf_counter() - start)
+
+    def flush_sync(self):
+        """Write the document immediately on the calling thread"""
+        if not self._dirty:
+            return
+
+        batch = self._dirty
+        self._dirty = set()
+        start = time.perf_counter()
+        try:
+            self.write(self.snapshot(batch))
+        except Exception as e:
+            self._dirty |= batch
+            logger.error(f"Error flushing {self.name}: {e}")
+            return
+
+        self._record_flush(len(batch), time.perf_counter() - start)
+
+    async def close(self):
+        """Cancel the pending delayed flush and write any remaining updates"""
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+        await self.flush()
+
+    def _record_flush(self, batch_size, latency):
+        self.flush_count += 1
+        self.last_batch_size = batch_size
+        self.last_flush_latency = latency
+        logger.info(
+            f"Flushed {self.name}: {batch_size} records in {latency * 1000:.1f}ms"
+        )
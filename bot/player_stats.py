@@ -0,0 +1,71 @@
+# Rating every player starts from before their first rated game
+DEFAULT_RATING = 1000.0
+
+class PlayerStats:
+    """Compact statistics record for one player.
+
+    Records are treated as immutable once stored: updates build a new record
+    with `with_result`, so snapshots for background writes can share them.
+    """
+
+    __slots__ = ("games_played", "wins", "losses", "rating")
+
+    def __init__(self, games_played=0, wins=0, losses=0, rating=DEFAULT_RATING):
+        self.games_played = games_played
+        self.wins = wins
+        self.losses = losses
+        self.rating = rating
+
+    @property
+    def win_rate(self):
+        """Fraction of games won, 0 when no games have been played"""
+        return self.wins / self.games_played if self.games_played else 0.0
+
+    def with_result(self, won, rating_delta=0.0):
+        """Return a new record with one more game recorded"""
+        return PlayerStats(
+            self.games_played + 1,
+            self.wins + (1 if won else 0),
+            self.losses + (0 if won else 1),
+            self.rating + rating_delta
+        )
+
+    def with_rating(self, rating):
+        """Return a copy of this record with a different rating"""
+        return PlayerStats(self.games_played, self.wins, self.losses, rating)
+
+    def to_dict(self):
+        return {
+            "games_played": self.games_played,
+            "wins": self.wins,
+            "losses": self.losses,
+            "rating": round(self.rating, 2)
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data.get("games_played", 0),
+            data.get("wins", 0),
+            data.get("losses", 0),
+            # Records written before ratings existed start at the default
+            data.get("rating") or DEFAULT_RATING
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, PlayerStats):
+            return NotImplemented
+        return (
+            (self.games_played, self.wins, self.losses, self.rating)
+            == (other.games_played, other.wins, other.losses, other.rating)
+        )
+
+    def __repr__(self):
+        return (
+            f"PlayerStats(games_played={self.games_played}, wins={self.wins}, "
+            f"losses={self.losses}, rating={self.rating:.1f})"
+        )
+
+def is_player_key(key, value):
+    """True for real player entries, False for metadata like _comment, _format"""
+    return not str(key).startswith('_') and isinstance(value, dict)
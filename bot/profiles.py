@@ -1,5 +1,3 @@
-import json
-import os
 import discord
 import logging
 from config import Config
@@ -9,52 +7,37 @@ logger = logging.getLogger(__name__)
 class ProfileManager:
     def __init__(self, bot):
         self.bot = bot
-        self._ensure_data_directory()
-        self.whitelist_file = "data/host_whitelist.json"
-        self.profiles_file = "data/user_profiles.json"
+        self.storage = bot.storage
         self.whitelist = self._load_whitelist()
         self.profiles = self._load_profiles()
     
-    def _ensure_data_directory(self):
-        """Ensure the data directory exists"""
-        if not os.path.exists("data"):
-            os.makedirs("data")
-    
     def _load_whitelist(self):
-        """Load host whitelist from file"""
+        """Load host whitelist from storage"""
         try:
-            if os.path.exists(self.whitelist_file):
-                with open(self.whitelist_file, 'r') as f:
-                    return json.load(f)
-            return {"hosts": []}
+            return self.storage.load_collection("host_whitelist", {"hosts": []})
         except Exception as e:
             logger.error(f"Error loading whitelist: {e}")
             return {"hosts": []}
     
     def _save_whitelist(self):
-        """Save host whitelist to file"""
+        """Save host whitelist to storage"""
         try:
-            with open(self.whitelist_file, 'w') as f:
-                json.dump(self.whitelist, f, indent=2)
+            self.storage.save_collection("host_whitelist", self.whitelist)
         except Exception as e:
             logger.error(f"Error saving whitelist: {e}")
     
     def _load_profiles(self):
-        """Load user profiles from file"""
+        """Load user profiles from storage"""
         try:
-            if os.path.exists(self.profiles_file):
-                with open(self.profiles_file, 'r') as f:
-                    return json.load(f)
-            return {}
+            return self.storage.load_collection("user_profiles", {})
         except Exception as e:
             logger.error(f"Error loading profiles: {e}")
             return {}
     
-    def _save_profiles(self):
-        """Save user profiles to file"""
+    def _save_profiles(self, changed_ids=None):
+        """Save user profiles to storage"""
         try:
-            with open(self.profiles_file, 'w') as f:
-                json.dump(self.profiles, f, indent=2)
+            self.storage.save_collection("user_profiles", self.profiles, changed_ids)
         except Exception as e:
             logger.error(f"Error saving profiles: {e}")
     
@@ -69,7 +52,7 @@ class ProfileManager:
             "in_game_name": in_game_name,
             "is_host": True
         }
-        self._save_profiles()
+        self._save_profiles([str(host_id)])
         
         # Assign host role
         try:
@@ -96,8 +79,8 @@ class ProfileManager:
         """Check if user has a profile"""
         return str(user_id) in self.profiles
     
-    async def send_host_setup_menu(self, channel):
-        """Send the host setup menu (admin only)"""
+    def build_host_setup_menu(self):
+        """Build the host setup menu embed and view"""
         embed = discord.Embed(
             title="🛠️ Host Setup",
             description="Setup new hosts and user profiles for the bot",
@@ -113,6 +96,11 @@ class ProfileManager:
         embed.set_footer(text="Admin only - Setup new hosts to use the bot")
         
         view = HostSetupView()
+        return embed, view
+    
+    async def send_host_setup_menu(self, channel):
+        """Send the host setup menu (admin only)"""
+        embed, view = self.build_host_setup_menu()
         await channel.send(embed=embed, view=view)
 
 class HostSetupView(discord.ui.View):
@@ -0,0 +1,46 @@
+import logging
+from bot.player_stats import DEFAULT_RATING
+
+logger = logging.getLogger(__name__)
+
+def expected_score(team_rating, opponent_rating):
+    """Elo expected score of a team against another"""
+    return 1.0 / (1.0 + 10 ** ((opponent_rating - team_rating) / 400.0))
+
+class RatingEngine:
+    """Team Elo: each side is rated by the average of its players' ratings.
+
+    Every player on a team moves by the same amount, K times the difference
+    between the team's result and its expected score.
+    """
+
+    def __init__(self, k_factor, initial_rating=DEFAULT_RATING):
+        self.k_factor = k_factor
+        self.initial_rating = initial_rating
+
+    def team_rating(self, ratings):
+        return sum(ratings) / len(ratings) if ratings else self.initial_rating
+
+    def game_deltas(self, team1_ratings, team2_ratings, winner):
+        """Rating change for each player of team 1 and team 2"""
+        expected1 = expected_score(self.team_rating(team1_ratings), self.team_rating(team2_ratings))
+        score1 = 1.0 if winner == 1 else 0.0
+        delta1 = self.k_factor * (score1 - expected1)
+        return delta1, -delta1
+
+    def replay(self, games):
+        """Recompute every rating from scratch.
+
+        `games` is an iterable of (team1_ids, team2_ids, winner) in the order
+        the games were played. Returns {user_id: rating}.
+        """
+        ratings = {}
+        for team1_ids, team2_ids, winner in games:
+            team1 = [ratings.get(user_id, self.initial_rating) for user_id in team1_ids]
+            team2 = [ratings.get(user_id, self.initial_rating) for user_id in team2_ids]
+            delta1, delta2 = self.game_deltas(team1, team2, winner)
+            for user_id, rating in zip(team1_ids, team1):
+                ratings[user_id] = rating + delta1
+            for user_id, rating in zip(team2_ids, team2):
+                ratings[user_id] = rating + delta2
+        return ratings
@@ -0,0 +1,118 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Datacenter locations per region: (location id, label, emoji)
+LOCATIONS = {
+    "east": [("ashburn", "Ashburn", "🏢"), ("ohio", "Ohio", "🌽")],
+    "central": [("iowa", "Iowa", "🌾"), ("san_antonio", "San Antonio", "🌵")],
+    "west": [("san_francisco", "San Francisco", "🌉"), ("quincy", "Quincy", "🏔️")]
+}
+
+# Preferences are stored as a bitmask with one bit per location
+LOCATION_BITS = {
+    location_id: 1 << bit
+    for bit, (location_id, _, _) in enumerate(
+        location for locations in LOCATIONS.values() for location in locations
+    )
+}
+LOCATION_IDS_BY_LABEL = {
+    label: location_id
+    for locations in LOCATIONS.values()
+    for location_id, label, _ in locations
+}
+
+def location_mask(location_ids):
+    mask = 0
+    for location_id in location_ids:
+        mask |= LOCATION_BITS[location_id]
+    return mask
+
+def mask_locations(mask):
+    return [location_id for location_id, bit in LOCATION_BITS.items() if mask & bit]
+
+class RegionIndex:
+    """Non-bot member ids per regional role, kept current from member events.
+
+    Built once from the guild, then updated from role changes so a find
+    request gets its target set without walking the role member list.
+    """
+
+    def __init__(self, regional_roles):
+        self.region_by_role = {role_id: region for region, role_id in regional_roles.items() if role_id}
+        self.members = {region: set() for region in regional_roles}
+        self.location_members = {location_id: set() for location_id in LOCATION_BITS}
+        self.preferences = {}  # member id -> location bitmask
+        self.ready = False
+
+    def build(self, guild):
+        """Index every regional role's members from the guild cache"""
+        for role_id, region in self.region_by_role.items():
+            role = guild.get_role(role_id)
+            if not role:
+                logger.error(f"Regional role for {region} not found")
+                continue
+            self.members[region] = {member.id for member in role.members if not member.bot}
+        self.ready = True
+        logger.info(
+            "Indexed region members: "
+            + ", ".join(f"{region} {len(ids)}" for region, ids in self.members.items())
+        )
+
+    def add_member(self, member):
+        if member.bot:
+            return
+        for role in member.roles:
+            region = self.region_by_role.get(role.id)
+            if region:
+                self.members[region].add(member.id)
+
+    def remove_member(self, member):
+        for ids in self.members.values():
+            ids.discard(member.id)
+
+    def update_member(self, before, after):
+        """Apply the regional role changes between two member snapshots"""
+        if after.bot:
+            return
+        before_roles = {role.id for role in before.roles}
+        after_roles = {role.id for role in after.roles}
+        for role_id in before_roles ^ after_roles:
+            region = self.region_by_role.get(role_id)
+            if not region:
+                continue
+            if role_id in after_roles:
+                self.members[region].add(after.id)
+            else:
+                self.members[region].discard(after.id)
+
+    def set_preferences(self, member_id, mask):
+        """Replace a member's preferred locations"""
+        old_mask = self.preferences.get(member_id, 0)
+        for location_id, bit in LOCATION_BITS.items():
+            if (old_mask ^ mask) & bit:
+                if mask & bit:
+                    self.location_members[location_id].add(member_id)
+                else:
+                    self.location_members[location_id].discard(member_id)
+        if mask:
+            self.preferences[member_id] = mask
+        else:
+            self.preferences.pop(member_id, None)
+
+    def location_member_ids(self, region, location_id):
+        """Members of a region who prefer a location"""
+        return self.member_ids(region) & self.location_members.get(location_id, set())
+
+    def member_ids(self, region):
+        """The live id set for a region; callers must not modify it"""
+        return self.members.get(region, set())
+
+    def counts(self):
+        return {region: len(ids) for region, ids in self.members.items()}
+
+    def location_counts(self, region):
+        return {
+            location_id: len(self.location_member_ids(region, location_id))
+            for location_id, _, _ in LOCATIONS.get(region, [])
+        }
@@ -1,81 +1,280 @@
-import json
-import os
 import discord
+import asyncio
 import logging
-from datetime import datetime
+import time
+from array import array
+from datetime import datetime, timedelta
 from config import Config
+from bot.persistence import WriteBehindWriter
+from bot.player_stats import DEFAULT_RATING, PlayerStats
+from bot.ratings import RatingEngine
+from bot.consistency import check_consistency
+from bot.leaderboard import Leaderboard, PeriodLeaderboards, PERIOD_BUCKETS, PERIOD_LABELS, period_start
+from bot.event_log import (
+    apply_game_event, empty_game_log,
+    GAME_ALLOCATED, GAME_STARTED, GAME_COMPLETED, GAME_CANCELLED
+)
 
 logger = logging.getLogger(__name__)
 
+# Ratings are stored rounded to 2 decimals, so smaller differences are not changes
+RATING_TOLERANCE = 0.01
+
 class StatsManager:
     def __init__(self, bot):
         self.bot = bot
-        self.stats_file = Config.PLAYER_STATS_FILE
-        self.log_file = Config.GAME_LOG_FILE
-        self._ensure_data_directory()
+        self.storage = bot.storage
+        self.rating_engine = RatingEngine(Config.RATING_K_FACTOR)
+        self.results_recorded = 0  # Bumped per result so long scans can detect races
         self._load_stats()
         self._load_game_log()
-    
-    def _ensure_data_directory(self):
-        """Ensure the data directory exists"""
-        os.makedirs("data", exist_ok=True)
+        self._build_game_indexes()
+        self._build_period_leaderboards()
+        self._load_leaderboard_message()
+        self.stats_writer = WriteBehindWriter(
+            self.storage.write_player_stats,
+            self._snapshot_stats,
+            Config.STATS_FLUSH_INTERVAL,
+            name="player stats"
+        )
     
     def _load_stats(self):
-        """Load player statistics from file"""
+        """Load player statistics from storage"""
         try:
-            if os.path.exists(self.stats_file):
-                with open(self.stats_file, 'r') as f:
-                    self.player_stats = json.load(f)
-            else:
-                self.player_stats = {}
+            self.player_stats = self.storage.load_player_stats()
         except Exception as e:
             logger.error(f"Error loading stats: {e}")
             self.player_stats = {}
+        self.leaderboard = Leaderboard.from_stats(self.player_stats)
     
-    def _save_stats(self):
-        """Save player statistics to file"""
+    def _load_leaderboard_message(self):
+        """Load the id of the persistent public leaderboard message"""
         try:
-            with open(self.stats_file, 'w') as f:
-                json.dump(self.player_stats, f, indent=2)
+            self.leaderboard_message = self.storage.load_collection("leaderboard_message", {})
         except Exception as e:
-            logger.error(f"Error saving stats: {e}")
+            logger.error(f"Error loading leaderboard message: {e}")
+            self.leaderboard_message = {}
+        self._leaderboard_task = None
+        self._leaderboard_dirty = False
+        self._last_leaderboard_render = None
+        self._last_leaderboard_edit = float("-inf")
+    
+    def _snapshot_stats(self, dirty_ids):
+        """Copy player statistics for serialization off the event loop"""
+        return self.storage.prepare_player_stats(self.player_stats, dirty_ids)
+    
+    def _save_stats(self, user_ids):
+        """Queue changed player statistics to be written to storage"""
+        self.stats_writer.mark_dirty(user_ids)
+    
+    async def close(self):
+        """Flush pending statistics before shutdown"""
+        if self._leaderboard_task and not self._leaderboard_task.done():
+            self._leaderboard_task.cancel()
+        await self.stats_writer.close()
+        await self.storage.close(self.game_log)
     
     def _load_game_log(self):
-        """Load game log from file"""
+        """Load game log from storage"""
         try:
-            if os.path.exists(self.log_file):
-                with open(self.log_file, 'r') as f:
-                    self.game_log = json.load(f)
-            else:
-                self.game_log = {"games": [], "last_game_number": 0}
+            self.game_log = self.storage.load_game_log()
         except Exception as e:
             logger.error(f"Error loading game log: {e}")
-            self.game_log = {"games": [], "last_game_number": 0}
+            self.game_log = empty_game_log()
+    
+    def _build_game_indexes(self):
+        """Index resident games by number and every game by player"""
+        self.games_by_number = {game["game_number"]: game for game in self.game_log["games"]}
+        
+        # Archived games come from the backend's player index, so no archive is read
+        games = self.game_log["games"]
+        oldest_resident = games[0]["game_number"] if games else self.game_log["last_game_number"] + 1
+        try:
+            archived = self.storage.load_archived_player_games(oldest_resident)
+        except Exception as e:
+            logger.error(f"Error loading archived player games: {e}")
+            archived = {}
+        self.games_by_player = {player_id: array('I', numbers) for player_id, numbers in archived.items()}
+        
+        # Each player's game numbers stay in ascending order so new games append
+        for game in games:
+            for player in game["team1"] + game["team2"]:
+                numbers = self.games_by_player.get(player["id"])
+                if numbers is None:
+                    numbers = self.games_by_player[player["id"]] = array('I')
+                numbers.append(game["game_number"])
+    
+    def _build_period_leaderboards(self):
+        """Replay results since the start of the oldest current period bucket"""
+        self.period_leaderboards = PeriodLeaderboards()
+        now = datetime.utcnow()
+        # Allow for games that started a day before their result was recorded
+        since = min(period_start(period, now) for period in PERIOD_BUCKETS) - timedelta(days=1)
+        
+        for game in self.iter_games(since=since.isoformat()):
+            self._record_period_result(game)
+    
+    def _record_period_result(self, game):
+        """Count a finished game towards the day/week/month/season boards"""
+        winner = game.get("winner")
+        if not winner:
+            return
+        
+        team1_ids = [player["id"] for player in game["team1"]]
+        team2_ids = [player["id"] for player in game["team2"]]
+        winners, losers = (team1_ids, team2_ids) if winner == 1 else (team2_ids, team1_ids)
+        finished_at = datetime.fromisoformat(game.get("end_timestamp") or game["timestamp"])
+        self.period_leaderboards.record(finished_at, winners, losers)
     
-    def _save_game_log(self):
-        """Save game log to file"""
+    def _index_game(self, entry):
+        """Add a newly started game to the number and player indexes"""
+        game_number = entry["game_number"]
+        self.games_by_number[game_number] = entry
+        for player in entry["team1"] + entry["team2"]:
+            numbers = self.games_by_player.setdefault(player["id"], array('I'))
+            if not numbers or numbers[-1] < game_number:
+                numbers.append(game_number)
+        
+        # Drop index entries for games that storage no longer keeps resident
+        if len(self.games_by_number) > 2 * max(len(self.game_log["games"]), Config.GAME_LOG_RECENT_GAMES):
+            self.games_by_number = {game["game_number"]: game for game in self.game_log["games"]}
+    
+    def _record_game_event(self, event):
+        """Apply a game event to the game log and persist it"""
         try:
-            with open(self.log_file, 'w') as f:
-                json.dump(self.game_log, f, indent=2)
+            entry = self.storage.record_game_event(self.game_log, event, self.games_by_number)
         except Exception as e:
-            logger.error(f"Error saving game log: {e}")
+            logger.error(f"Error recording game event: {e}")
+            # Storage may have applied the event before the write failed, and a
+            # new game is not indexed yet, so scan the log to stay idempotent
+            entry = apply_game_event(self.game_log, event)
+        
+        if entry is not None and event["event"] == GAME_STARTED:
+            self._index_game(entry)
+        return entry
+    
+    def get_game(self, game_number):
+        """Get a game log entry by number, loading it from the archive if needed"""
+        # The index can still hold games that were archived since, and late
+        # results for those only update the archived copy
+        games = self.game_log["games"]
+        if games and game_number >= games[0]["game_number"]:
+            game = self.games_by_number.get(game_number)
+            if game is not None:
+                return game
+        return self.storage.get_archived_game(game_number)
+    
+    def get_player_game_count(self, user_id):
+        """Number of logged games a player has taken part in"""
+        return len(self.games_by_player.get(int(user_id), ()))
+    
+    def get_player_games(self, user_id, offset=0, limit=5):
+        """Get a page of a player's games, newest first"""
+        numbers = self.games_by_player.get(int(user_id))
+        if not numbers:
+            return []
+        
+        end = len(numbers) - offset
+        start = max(end - limit, 0)
+        games = []
+        for game_number in reversed(numbers[start:max(end, 0)]):
+            game = self.get_game(game_number)
+            if game is not None:
+                games.append(game)
+        return games
+    
+    def get_recent_teammates(self, user_ids, games_per_player):
+        """Count how often each pair of these players shared a team recently.
+        
+        Looks at each player's last `games_per_player` games and returns
+        {(user_id, user_id): count} with the smaller id first.
+        """
+        user_ids = set(user_ids)
+        game_numbers = set()
+        for user_id in user_ids:
+            numbers = self.games_by_player.get(user_id)
+            if numbers:
+                game_numbers.update(numbers[-games_per_player:])
+        
+        counts = {}
+        for game_number in game_numbers:
+            game = self.get_game(game_number)
+            if game is None or game.get("status") == GAME_CANCELLED:
+                continue
+            for team in (game["team1"], game["team2"]):
+                present = sorted(player["id"] for player in team if player["id"] in user_ids)
+                for index, first in enumerate(present):
+                    for second in present[index + 1:]:
+                        counts[(first, second)] = counts.get((first, second), 0) + 1
+        return counts
+    
+    def iter_games(self, since=None, until=None):
+        """Yield game log entries newest first, resident games before archived ones"""
+        games = self.game_log["games"]
+        for game in reversed(games):
+            if since is not None and game["timestamp"] < since:
+                continue
+            if until is not None and game["timestamp"] > until:
+                continue
+            yield game
+        
+        oldest_resident = games[0]["game_number"] if games else self.game_log["last_game_number"] + 1
+        yield from self.storage.iter_archived_games(oldest_resident, since, until)
+    
+    def search_games(self, query, limit=10):
+        """Search the game log by game number or player name, newest first"""
+        query = query.strip().lower()
+        if query.lstrip('#').isdigit():
+            game = self.get_game(int(query.lstrip('#')))
+            return [game] if game else []
+        
+        results = []
+        for game in self.iter_games():
+            if query != "all":
+                names = [player["name"].lower() for player in game["team1"] + game["team2"]]
+                if not any(query in name for name in names):
+                    continue
+            results.append(game)
+            if len(results) >= limit:
+                break
+        return results
     
     def get_player_stats(self, user_id):
-        """Get statistics for a player"""
-        user_id = str(user_id)
-        if user_id not in self.player_stats:
-            self.player_stats[user_id] = {
-                "games_played": 0,
-                "wins": 0,
-                "losses": 0
-            }
-        return self.player_stats[user_id].copy()
+        """Get statistics for a player (an empty record if they have none)"""
+        stats = self.player_stats.get(int(user_id))
+        return stats if stats is not None else PlayerStats()
+    
+    def _set_player_stats(self, user_id, stats):
+        """Store a player's new record and reposition them on the leaderboard"""
+        self.player_stats[user_id] = stats
+        self.leaderboard.update(user_id, stats)
+    
+    def order_by_rating(self, user_id, candidate_ids):
+        """Order candidates by how close their rating is to a player's.
+        
+        Candidates within the same FIND_RATING_BAND are ordered by their most
+        recent game; players without any games come last.
+        """
+        rating = self.get_player_stats(user_id).rating
+        
+        def sort_key(candidate_id):
+            stats = self.player_stats.get(candidate_id)
+            if stats is None or not stats.games_played:
+                return (float("inf"), 0)
+            return (abs(stats.rating - rating) // Config.FIND_RATING_BAND, -self._last_game_number(candidate_id))
+        
+        return sorted(candidate_ids, key=sort_key)
+    
+    def _last_game_number(self, user_id):
+        """Number of a player's latest game, 0 if they have none"""
+        numbers = self.games_by_player.get(user_id)
+        return numbers[-1] if numbers else 0
     
     def get_next_game_number(self):
         """Get the next game number"""
-        self.game_log["last_game_number"] += 1
-        self._save_game_log()
-        return self.game_log["last_game_number"]
+        game_number = self.game_log["last_game_number"] + 1
+        self._record_game_event({"event": GAME_ALLOCATED, "game_number": game_number})
+        return game_number
     
     async def update_game_stats(self, game_data, winning_team):
         """Update player statistics after a game"""
@@ -90,23 +289,131 @@ class StatsManager:
             winners = team2_ids
             losers = team1_ids
         
-        # Update winner stats
+        # Both sides are rated by their players' average rating before the game
+        winner_delta, loser_delta = self.rating_engine.game_deltas(
+            [self.get_player_stats(user_id).rating for user_id in winners],
+            [self.get_player_stats(user_id).rating for user_id in losers],
+            winner=1
+        )
+        
+        # Records are replaced rather than mutated so pending snapshots stay valid
         for user_id in winners:
-            user_id = str(user_id)
-            stats = self.get_player_stats(user_id)
-            stats['games_played'] += 1
-            stats['wins'] += 1
-            self.player_stats[user_id] = stats
+            self._set_player_stats(user_id, self.get_player_stats(user_id).with_result(True, winner_delta))
         
-        # Update loser stats
         for user_id in losers:
-            user_id = str(user_id)
-            stats = self.get_player_stats(user_id)
-            stats['games_played'] += 1
-            stats['losses'] += 1
-            self.player_stats[user_id] = stats
+            self._set_player_stats(user_id, self.get_player_stats(user_id).with_result(False, loser_delta))
         
-        self._save_stats()
+        self._save_stats(winners + losers)
+        self.results_recorded += 1
+        self.request_leaderboard_refresh()
+    
+    def _all_games(self):
+        """Snapshot the resident games and return a generator over the full log.
+        
+        The generator only reads storage, so it can be consumed in a worker thread.
+        """
+        resident = list(self.game_log["games"])
+        oldest_resident = resident[0]["game_number"] if resident else self.game_log["last_game_number"] + 1
+        
+        def games():
+            yield from reversed(resident)
+            yield from self.storage.iter_archived_games(oldest_resident)
+        
+        return games()
+    
+    @staticmethod
+    def _rated_games(all_games):
+        """(team1_ids, team2_ids, winner) for every decided game, oldest result first"""
+        games = [game for game in all_games if game.get("winner") in (1, 2)]
+        # Ratings were applied as results came in, so replay in that order
+        games.sort(key=lambda game: game.get("end_timestamp") or game["timestamp"])
+        return [
+            (
+                [player["id"] for player in game["team1"]],
+                [player["id"] for player in game["team2"]],
+                game["winner"]
+            )
+            for game in games
+        ]
+    
+    async def rebuild_ratings(self):
+        """Recompute every player's rating by replaying the whole game log"""
+        all_games = self._all_games()
+        snapshot = dict(self.player_stats)
+        
+        def replay():
+            # Reading archives and replaying both stay off the event loop
+            games = self._rated_games(all_games)
+            return len(games), self.rating_engine.replay(games)
+        
+        started = time.perf_counter()
+        game_count, ratings = await asyncio.to_thread(replay)
+        elapsed = time.perf_counter() - started
+        
+        changed = []
+        for user_id, stats in list(self.player_stats.items()):
+            # A result recorded during the replay already moved this player's rating on
+            if snapshot.get(user_id) is not stats:
+                continue
+            rating = ratings.get(user_id, DEFAULT_RATING)
+            if abs(rating - stats.rating) > RATING_TOLERANCE:
+                self._set_player_stats(user_id, stats.with_rating(rating))
+                changed.append(user_id)
+        
+        if changed:
+            self._save_stats(changed)
+            self.request_leaderboard_refresh()
+        
+        logger.info(
+            f"Rebuilt ratings from {game_count} games in {elapsed:.2f}s "
+            f"({len(changed)} players changed)"
+        )
+        return game_count, len(changed), elapsed
+    
+    async def check_consistency(self):
+        """Stream the whole game log in a worker thread and diff it against live stats"""
+        active = {game["game_number"] for game in self.bot.active_games.values()}
+        return await asyncio.to_thread(check_consistency, self._all_games(), dict(self.player_stats), active)
+    
+    async def repair_stats(self):
+        """Cancel orphaned games and reset player totals to what the game log records"""
+        for _ in range(3):
+            recorded = self.results_recorded
+            report = await self.check_consistency()
+            if recorded == self.results_recorded:
+                break
+        else:
+            raise RuntimeError("Results kept arriving while the game log was scanned")
+        
+        # Games left "started" by a restart or crash can never get a result now
+        active = {game["game_number"] for game in self.bot.active_games.values()}
+        cancelled = 0
+        for game_number in report.unfinished_numbers:
+            if game_number in active:
+                continue
+            self._record_game_event({
+                "event": GAME_CANCELLED,
+                "game_number": game_number,
+                "winner": None,
+                "end_timestamp": datetime.utcnow().isoformat()
+            })
+            cancelled += 1
+        
+        # Ratings are not derived from totals, so each player keeps theirs
+        repaired = []
+        for user_id, expected, _ in report.mismatches:
+            rating = self.get_player_stats(user_id).rating
+            self._set_player_stats(
+                user_id, PlayerStats(expected.games_played, expected.wins, expected.losses, rating)
+            )
+            repaired.append(user_id)
+        
+        if repaired:
+            self._save_stats(repaired)
+            self.request_leaderboard_refresh()
+        
+        logger.info(f"Repaired stats for {len(repaired)} players, cancelled {cancelled} orphaned games")
+        return report, len(repaired), cancelled
     
     async def log_game_start(self, guild, game_number, team1, team2):
         """Log when a game starts"""
@@ -119,8 +426,11 @@ class StatsManager:
             "winner": None
         }
         
-        self.game_log["games"].append(log_entry)
-        self._save_game_log()
+        self._record_game_event({
+            "event": GAME_STARTED,
+            "game_number": game_number,
+            "game": log_entry
+        })
         
         # Send to log channel if configured
         await self._send_game_log(guild, f"🎮 **Game #{game_number} Started**", log_entry)
@@ -129,15 +439,12 @@ class StatsManager:
         """Log when a game ends"""
         game_number = game_data['game_number']
         
-        # Find the game in the log
-        for game in self.game_log["games"]:
-            if game["game_number"] == game_number:
-                game["status"] = "completed" if winner > 0 else "cancelled"
-                game["winner"] = winner if winner > 0 else None
-                game["end_timestamp"] = datetime.utcnow().isoformat()
-                break
-        
-        self._save_game_log()
+        log_entry = self._record_game_event({
+            "event": GAME_COMPLETED if winner > 0 else GAME_CANCELLED,
+            "game_number": game_number,
+            "winner": winner if winner > 0 else None,
+            "end_timestamp": datetime.utcnow().isoformat()
+        })
         
         # Send to log channel
         if winner == 0:
@@ -146,13 +453,11 @@ class StatsManager:
             winning_team = "Team 1" if winner == 1 else "Team 2"
             message = f"🎉 **Game #{game_number} Completed - {winning_team} Wins!**"
         
-        # Find the log entry
-        log_entry = None
-        for game in self.game_log["games"]:
-            if game["game_number"] == game_number:
-                log_entry = game
-                break
+        if log_entry is None:
+            logger.warning(f"Game #{game_number} ended but was never logged as started")
+            return
         
+        self._record_period_result(log_entry)
         await self._send_game_log(guild, message, log_entry)
     
     async def _send_game_log(self, guild, title, log_entry):
@@ -196,56 +501,131 @@ class StatsManager:
         except Exception as e:
             logger.error(f"Error sending game log: {e}")
     
-    def get_leaderboard(self, limit=10):
-        """Get leaderboard sorted by wins"""
-        leaderboard = []
-        
-        for user_id, stats in self.player_stats.items():
-            # Skip non-user entries like _comment, _format
-            if user_id.startswith('_') or not isinstance(stats, dict):
-                continue
-            if stats.get('games_played', 0) > 0:
-                leaderboard.append((int(user_id), stats))
-        
-        # Sort by wins, then by win rate
-        leaderboard.sort(key=lambda x: (x[1]['wins'], x[1]['wins']/x[1]['games_played']), reverse=True)
+    def get_player_rank(self, user_id):
+        """Get (rank, ranked player count) for a player, or None if unranked"""
+        rank = self.leaderboard.rank(int(user_id))
+        if rank is None:
+            return None
+        return rank, len(self.leaderboard)
+    
+    def get_players_around(self, user_id, radius=2):
+        """Get [(rank, user_id, stats)] for a player and their neighbours"""
+        return [
+            (rank, neighbour_id, self.player_stats[neighbour_id])
+            for rank, neighbour_id in self.leaderboard.around(int(user_id), radius)
+        ]
+    
+    def get_leaderboard(self, limit=10, period="lifetime"):
+        """Get leaderboard sorted by wins, then by win rate.
         
-        return leaderboard[:limit]
+        `period` is "lifetime" or one of "today", "week", "month", "season".
+        """
+        if period != "lifetime":
+            return self.period_leaderboards.top(period, datetime.utcnow(), limit)
+        return [(user_id, self.player_stats[user_id]) for user_id in self.leaderboard.top(limit)]
     
-    async def post_public_leaderboard(self, interaction):
-        """Post leaderboard to public channel"""
-        leaderboard = self.get_leaderboard()
+    def build_leaderboard_embed(self, period="lifetime"):
+        """Build a leaderboard embed from the current top 10 for a period"""
+        leaderboard = self.get_leaderboard(period=period)
         
+        title = "🏆 Current Leaderboard" if period == "lifetime" else f"🏆 Leaderboard - {PERIOD_LABELS[period]}"
         embed = discord.Embed(
-            title="🏆 Current Leaderboard",
+            title=title,
             color=discord.Color.gold(),
             timestamp=datetime.utcnow()
         )
         
         if not leaderboard:
-            embed.description = "No games played yet!"
+            embed.description = "No games played yet!" if period == "lifetime" else "No games played in this period yet!"
         else:
             description = ""
             for i, (user_id, stats) in enumerate(leaderboard[:10], 1):
                 try:
-                    user = interaction.client.get_user(user_id)
+                    user = self.bot.get_user(user_id)
                     name = user.display_name if user else f"User {user_id}"
-                    win_rate = (stats['wins'] / stats['games_played']) * 100 if stats['games_played'] > 0 else 0
-                    description += f"{i}. **{name}** - {stats['wins']}W/{stats['losses']}L ({win_rate:.1f}%)\n"
+                    win_rate = stats.win_rate * 100
+                    description += f"{i}. **{name}** - {stats.wins}W/{stats.losses}L ({win_rate:.1f}%)"
+                    if period == "lifetime":
+                        description += f" · {stats.rating:.0f}"
+                    description += "\n"
                 except Exception:
                     continue
             embed.description = description
         
-        embed.set_footer(text=f"Requested by {interaction.user.display_name}")
+        embed.set_footer(text="Last updated")
+        return embed
+    
+    def request_leaderboard_refresh(self):
+        """Schedule an edit of the public leaderboard message.
+        
+        Requests are coalesced: at most one edit happens per
+        LEADERBOARD_EDIT_INTERVAL, after a short debounce so a burst of
+        results or clicks produces a single edit.
+        """
+        self._leaderboard_dirty = True
+        if self._leaderboard_task and not self._leaderboard_task.done():
+            return
         
-        # Send to leaderboard channel
+        delay = max(
+            Config.LEADERBOARD_DEBOUNCE,
+            self._last_leaderboard_edit + Config.LEADERBOARD_EDIT_INTERVAL - time.monotonic()
+        )
+        self._leaderboard_task = asyncio.get_running_loop().create_task(
+            self._refresh_leaderboard_after(delay)
+        )
+    
+    async def _refresh_leaderboard_after(self, delay):
+        await asyncio.sleep(delay)
+        self._leaderboard_dirty = False
         try:
-            leaderboard_channel = interaction.guild.get_channel(Config.LEADERBOARD_CHANNEL_ID)
-            if leaderboard_channel:
-                await leaderboard_channel.send(embed=embed)
-                await interaction.response.send_message("✅ Leaderboard posted!", ephemeral=True)
-            else:
-                await interaction.response.send_message("❌ Leaderboard channel not found!", ephemeral=True)
+            await self._refresh_leaderboard_message()
         except Exception as e:
-            logger.error(f"Error posting leaderboard: {e}")
-            await interaction.response.send_message("❌ Error posting leaderboard!", ephemeral=True)
+            logger.error(f"Error refreshing leaderboard: {e}")
+        
+        # Changes that arrived during the edit get their own (rate limited) edit
+        if self._leaderboard_dirty:
+            self._leaderboard_task = None
+            self.request_leaderboard_refresh()
+    
+    async def _refresh_leaderboard_message(self):
+        """Edit the persistent leaderboard message if the standings changed"""
+        embed = self.build_leaderboard_embed()
+        if embed.description == self._last_leaderboard_render:
+            return
+        
+        guild = self.bot.get_guild(Config.GUILD_ID)
+        channel = guild.get_channel(Config.LEADERBOARD_CHANNEL_ID) if guild else None
+        if not channel:
+            logger.error("Leaderboard channel not found")
+            return
+        
+        message_id = self.leaderboard_message.get("message_id")
+        if message_id and self.leaderboard_message.get("channel_id") == channel.id:
+            try:
+                await channel.get_partial_message(message_id).edit(embed=embed)
+                self._mark_leaderboard_edited(embed)
+                return
+            except discord.NotFound:
+                logger.info("Leaderboard message was deleted, posting a new one")
+        
+        message = await channel.send(embed=embed)
+        self.leaderboard_message = {"channel_id": channel.id, "message_id": message.id}
+        self.storage.save_collection("leaderboard_message", self.leaderboard_message)
+        self._mark_leaderboard_edited(embed)
+    
+    def _mark_leaderboard_edited(self, embed):
+        self._last_leaderboard_render = embed.description
+        self._last_leaderboard_edit = time.monotonic()
+    
+    async def post_public_leaderboard(self, interaction):
+        """Refresh the public leaderboard message"""
+        self.request_leaderboard_refresh()
+        
+        message_id = self.leaderboard_message.get("message_id")
+        channel_id = self.leaderboard_message.get("channel_id")
+        if message_id and channel_id:
+            link = f"https://discord.com/channels/{interaction.guild.id}/{channel_id}/{message_id}"
+            content = f"✅ The leaderboard will be updated shortly: {link}"
+        else:
+            content = f"✅ The leaderboard will be posted shortly in <#{Config.LEADERBOARD_CHANNEL_ID}>!"
+        await interaction.response.send_message(content, ephemeral=True)
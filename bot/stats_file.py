@@ -0,0 +1,220 @@
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Header: magic, version, record size, sorted record count, total record count
+HEADER = struct.Struct("<4sHHQQ")
+# Record: user id, games played, wins, losses, rating
+RECORD = struct.Struct("<QIIId")
+MAGIC = b"DCPS"
+VERSION = 2
+# Version 1 stored the rating as float32 next to an unused streak field
+RECORD_V1 = struct.Struct("<QIIIfi")
+
+# Grow the file in steps so appends don't resize the mapping every time
+GROWTH_RECORDS = 1024
+
+class BinaryStatsFile:
+    """Fixed-width player stats records accessed through mmap.
+
+    Records [0, sorted_count) are kept sorted by user id and found by binary
+    search directly in the mapping. Players seen for the first time are
+    appended after them and tracked in a small in-memory index until
+    `compact` merges them into the sorted region. Updating a known player
+    rewrites only that player's record.
+
+    A file must have a single writer: one BinaryStatsFile in one process.
+    Within it, every access goes through `_lock`, and `compact` swaps in a
+    new file under that lock rather than rewriting the mapping in place.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+        self._mmap = None
+        self.sorted_count = 0
+        self.total_count = 0
+        self.capacity = 0
+        self._overflow = {}  # user id -> slot for records outside the sorted region
+        self._open()
+
+    def _open(self):
+        if not os.path.exists(self.path) or os.path.getsize(self.path) < HEADER.size:
+            with open(self.path, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, VERSION, RECORD.size, 0, 0))
+                f.write(b"\0" * RECORD.size * GROWTH_RECORDS)
+
+        self._file = open(self.path, 'r+b')
+        self._mmap = mmap.mmap(self._file.fileno(), 0)
+
+        magic, version, record_size, sorted_count, total_count = HEADER.unpack_from(self._mmap, 0)
+        if magic == MAGIC and version == 1 and record_size == RECORD_V1.size:
+            self._upgrade_v1(total_count)
+            return
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            raise ValueError(f"{self.path} is not a version {VERSION} player stats file")
+
+        self.sorted_count = sorted_count
+        self.total_count = total_count
+        self.capacity = (len(self._mmap) - HEADER.size) // RECORD.size
+        self._overflow = {
+            RECORD.unpack_from(self._mmap, self._offset(slot))[0]: slot
+            for slot in range(sorted_count, total_count)
+        }
+
+    def _upgrade_v1(self, total_count):
+        """Rewrite a version 1 file in the current format and reopen it"""
+        end = HEADER.size + total_count * RECORD_V1.size
+        records = sorted(record[:5] for record in RECORD_V1.iter_unpack(self._mmap[HEADER.size:end]))
+        self._close_mapping()
+        _write_records(self.path, records)
+        logger.info(f"Upgraded {self.path} to version {VERSION}")
+        self._open()
+
+    def _close_mapping(self):
+        self._mmap.close()
+        self._file.close()
+
+    def _offset(self, slot):
+        return HEADER.size + slot * RECORD.size
+
+    def _find_slot(self, user_id):
+        """Locate a player's record: binary search, then the overflow index"""
+        low, high = 0, self.sorted_count
+        while low < high:
+            mid = (low + high) // 2
+            mid_id = struct.unpack_from("<Q", self._mmap, self._offset(mid))[0]
+            if mid_id < user_id:
+                low = mid + 1
+            elif mid_id > user_id:
+                high = mid
+            else:
+                return mid
+        return self._overflow.get(user_id)
+
+    def get(self, user_id):
+        """Return a player's stats dict, or None if they have no record"""
+        with self._lock:
+            slot = self._find_slot(int(user_id))
+            if slot is None:
+                return None
+            return _record_to_stats(RECORD.unpack_from(self._mmap, self._offset(slot)))
+
+    def put_many(self, records):
+        """Write {user_id: stats} records in place, appending unseen players"""
+        with self._lock:
+            for user_id, stats in records.items():
+                user_id = int(user_id)
+                slot = self._find_slot(user_id)
+                if slot is None:
+                    slot = self._append_slot(user_id)
+                RECORD.pack_into(self._mmap, self._offset(slot), *_stats_to_record(user_id, stats))
+            self._write_header()
+            self._mmap.flush()
+
+    def _append_slot(self, user_id):
+        if self.total_count >= self.capacity:
+            self._grow()
+        slot = self.total_count
+        self.total_count += 1
+        self._overflow[user_id] = slot
+        return slot
+
+    def _grow(self):
+        self._mmap.close()
+        self._file.truncate(self._offset(self.capacity + GROWTH_RECORDS))
+        self._mmap = mmap.mmap(self._file.fileno(), 0)
+        self.capacity += GROWTH_RECORDS
+
+    def _write_header(self):
+        HEADER.pack_into(self._mmap, 0, MAGIC, VERSION, RECORD.size, self.sorted_count, self.total_count)
+
+    def items(self):
+        """Iterate (user_id, stats) over every record"""
+        with self._lock:
+            end = self._offset(self.total_count)
+            records = list(RECORD.iter_unpack(self._mmap[HEADER.size:end]))
+        for record in records:
+            yield record[0], _record_to_stats(record)
+
+    def compact(self):
+        """Merge appended records into the sorted region.
+
+        The sorted records go to a new file that replaces the old one, so a
+        crash part way through leaves the previous file intact.
+        """
+        with self._lock:
+            if not self._overflow:
+                return
+            end = self._offset(self.total_count)
+            records = sorted(RECORD.iter_unpack(self._mmap[HEADER.size:end]))
+            self._close_mapping()
+            _write_records(self.path, records)
+            self._open()
+        logger.info(f"Compacted {self.path}: {self.total_count} sorted records")
+
+    def close(self):
+        self.compact()
+        with self._lock:
+            self._close_mapping()
+
+def _record_to_stats(record):
+    _, games_played, wins, losses, rating = record
+    stats = {"games_played": games_played, "wins": wins, "losses": losses}
+    if rating:
+        stats["rating"] = rating
+    return stats
+
+def _stats_to_record(user_id, stats):
+    return (
+        user_id,
+        stats.get("games_played", 0),
+        stats.get("wins", 0),
+        stats.get("losses", 0),
+        stats.get("rating", 0.0)
+    )
+
+def _write_records(path, records):
+    """Atomically replace a stats file with already sorted record tuples"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, RECORD.size, len(records), len(records)))
+        f.write(b"".join(RECORD.pack(*record) for record in records))
+        f.write(b"\0" * RECORD.size * GROWTH_RECORDS)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def write_binary(path, records):
+    """Write {user_id: stats} records as a fully sorted binary stats file"""
+    _write_records(path, sorted(_stats_to_record(int(user_id), stats) for user_id, stats in records.items()))
+
+def json_to_binary(json_path, binary_path):
+    """Convert a player_stats.json document into the binary format"""
+    with open(json_path, 'r') as f:
+        player_stats = json.load(f)
+
+    records = {
+        user_id: stats for user_id, stats in player_stats.items()
+        # Skip non-user entries like _comment, _format
+        if not user_id.startswith('_') and isinstance(stats, dict)
+    }
+
+    write_binary(binary_path, records)
+    return len(records)
+
+def binary_to_json(binary_path, json_path):
+    """Convert a binary stats file back into the player_stats.json layout"""
+    stats_file = BinaryStatsFile(binary_path)
+    player_stats = {str(user_id): stats for user_id, stats in stats_file.items()}
+    stats_file.close()
+
+    with open(json_path, 'w') as f:
+        json.dump(player_stats, f, indent=2)
+    return len(player_stats)
@@ -0,0 +1,470 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+from config import Config
+from bot.persistence import write_json_atomic
+from bot.player_stats import DEFAULT_RATING, PlayerStats, is_player_key
+from bot.stats_file import BinaryStatsFile, json_to_binary
+from bot.game_archive import GameArchive
+from bot.event_log import (
+    GameEventLog, apply_game_event, empty_game_log,
+    GAME_ALLOCATED, GAME_STARTED, GAME_COMPLETED, GAME_CANCELLED
+)
+
+logger = logging.getLogger(__name__)
+
+class StorageBackend:
+    """Interface the managers use to load and persist bot data.
+
+    Player stats are {int user id: PlayerStats} maps written through a
+    WriteBehindWriter: `prepare_player_stats` runs on the event loop and must
+    be cheap, `write_player_stats` runs in a worker thread. Only recent games are kept resident in the loaded game
+    log; older games are read back on demand through the archive methods.
+    Collections are small string-keyed documents such as profiles and the
+    host whitelist.
+    """
+
+    def load_player_stats(self):
+        raise NotImplementedError
+
+    def prepare_player_stats(self, player_stats, dirty_ids):
+        raise NotImplementedError
+
+    def write_player_stats(self, payload):
+        raise NotImplementedError
+
+    def load_game_log(self):
+        raise NotImplementedError
+
+    def record_game_event(self, game_log, event, index=None):
+        """Apply a game event to the resident log, persist it and return the game.
+
+        `index` optionally maps game numbers to resident entries.
+        """
+        raise NotImplementedError
+
+    def get_archived_game(self, game_number):
+        raise NotImplementedError
+
+    def iter_archived_games(self, before_number=None, since=None, until=None):
+        """Yield non-resident games newest first, optionally within a time range"""
+        raise NotImplementedError
+
+    def load_archived_player_games(self, before_number=None):
+        """Map each player id to the ascending numbers of their non-resident games"""
+        raise NotImplementedError
+
+    def load_collection(self, name, default):
+        raise NotImplementedError
+
+    def save_collection(self, name, data, changed_keys=None):
+        raise NotImplementedError
+
+    async def close(self, game_log):
+        pass
+
+class JSONStorage(StorageBackend):
+    """The original file layout: one JSON document per data set under data/"""
+
+    def __init__(self):
+        self.stats_file = Config.PLAYER_STATS_FILE
+        self.stats_metadata = {}  # Non-player entries like _comment, kept on save
+        self.binary_stats = None
+        if Config.PLAYER_STATS_FORMAT.lower() == "binary":
+            self.binary_stats = self._open_binary_stats()
+        self.archive = GameArchive(
+            Config.GAME_ARCHIVE_DIR,
+            Config.GAME_LOG_SEGMENT_SIZE,
+            Config.GAME_LOG_RECENT_GAMES
+        )
+        self.event_log = GameEventLog(
+            Config.GAME_LOG_FILE,
+            Config.GAME_EVENT_LOG_FILE,
+            Config.GAME_LOG_COMPACT_EVENTS,
+            archive=self.archive
+        )
+        self.collection_files = {
+            "host_whitelist": Config.HOST_WHITELIST_FILE,
+            "user_profiles": Config.USER_PROFILES_FILE
+        }
+
+    def _open_binary_stats(self):
+        """Open the binary stats file, converting the JSON stats on first use"""
+        binary_file = Config.PLAYER_STATS_BINARY_FILE
+        if not os.path.exists(binary_file) and os.path.exists(self.stats_file):
+            count = json_to_binary(self.stats_file, binary_file)
+            logger.info(f"Converted {count} player records to {binary_file}")
+        return BinaryStatsFile(binary_file)
+
+    def load_player_stats(self):
+        if self.binary_stats:
+            return {
+                user_id: PlayerStats.from_dict(stats)
+                for user_id, stats in self.binary_stats.items()
+            }
+
+        player_stats = {}
+        for key, value in self._load_json(self.stats_file, {}).items():
+            if is_player_key(key, value):
+                player_stats[int(key)] = PlayerStats.from_dict(value)
+            else:
+                self.stats_metadata[key] = value
+        return player_stats
+
+    def prepare_player_stats(self, player_stats, dirty_ids):
+        if self.binary_stats:
+            # Only the changed fixed-width records are rewritten
+            return {
+                user_id: player_stats[user_id]
+                for user_id in dirty_ids
+                if user_id in player_stats
+            }
+        # The whole document is rewritten; records are replaced rather than
+        # mutated, so a shallow copy is enough
+        return dict(player_stats)
+
+    def write_player_stats(self, payload):
+        if self.binary_stats:
+            self.binary_stats.put_many({user_id: stats.to_dict() for user_id, stats in payload.items()})
+            return
+
+        document = dict(self.stats_metadata)
+        document.update((str(user_id), stats.to_dict()) for user_id, stats in payload.items())
+        write_json_atomic(self.stats_file, document)
+
+    def load_game_log(self):
+        game_log = self.event_log.load()
+        self.event_log.schedule_compaction(game_log)
+        return game_log
+
+    def record_game_event(self, game_log, event, index=None):
+        entry = apply_game_event(game_log, event, self.archive, index)
+        self.event_log.append(event)
+        self.event_log.schedule_compaction(game_log)
+        return entry
+
+    def get_archived_game(self, game_number):
+        return self.archive.get_game(game_number)
+
+    def iter_archived_games(self, before_number=None, since=None, until=None):
+        return self.archive.iter_games(before_number, since, until)
+
+    def load_archived_player_games(self, before_number=None):
+        return self.archive.load_player_games(before_number)
+
+    def load_collection(self, name, default):
+        return self._load_json(self._collection_file(name), default)
+
+    def save_collection(self, name, data, changed_keys=None):
+        write_json_atomic(self._collection_file(name), data)
+
+    async def close(self, game_log):
+        await self.event_log.close(game_log)
+        if self.binary_stats:
+            self.binary_stats.close()
+
+    def _collection_file(self, name):
+        return self.collection_files.get(name, f"data/{name}.json")
+
+    def _load_json(self, path, default):
+        try:
+            if os.path.exists(path):
+                with open(path, 'r') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading {path}: {e}")
+        return default
+
+class SQLiteStorage(StorageBackend):
+    """Indexed SQLite storage with small per-record writes.
+
+    Each game event is committed in its own transaction and stat flushes
+    only touch the players that changed.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS player_stats (
+            player_id INTEGER PRIMARY KEY,
+            games_played INTEGER NOT NULL DEFAULT 0,
+            wins INTEGER NOT NULL DEFAULT 0,
+            losses INTEGER NOT NULL DEFAULT 0,
+            rating REAL NOT NULL DEFAULT 1000
+        );
+        CREATE TABLE IF NOT EXISTS games (
+            game_number INTEGER PRIMARY KEY,
+            timestamp TEXT NOT NULL,
+            status TEXT NOT NULL,
+            winner INTEGER,
+            end_timestamp TEXT,
+            team1 TEXT NOT NULL,
+            team2 TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_games_timestamp ON games (timestamp);
+        CREATE TABLE IF NOT EXISTS game_players (
+            game_number INTEGER NOT NULL,
+            player_id INTEGER NOT NULL,
+            team INTEGER NOT NULL,
+            PRIMARY KEY (game_number, player_id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_game_players_player ON game_players (player_id, game_number);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS collections (
+            name TEXT NOT NULL,
+            key TEXT NOT NULL,
+            value TEXT NOT NULL,
+            PRIMARY KEY (name, key)
+        );
+    """
+
+    def __init__(self, path=None, import_from=None):
+        self.path = path or Config.SQLITE_DB_FILE
+        is_new = not os.path.exists(self.path)
+
+        # Stat flushes run in worker threads, so share one guarded connection
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        self._migrate()
+
+        if is_new and import_from is not None:
+            self.import_from(import_from)
+
+    def _migrate(self):
+        """Add columns introduced after a database was created"""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(player_stats)")}
+        if "rating" not in columns:
+            with self.conn:
+                self.conn.execute(
+                    f"ALTER TABLE player_stats ADD COLUMN rating REAL NOT NULL DEFAULT {DEFAULT_RATING}"
+                )
+            logger.info("Added rating column to player_stats")
+
+    def import_from(self, source):
+        """Copy every data set out of another backend"""
+        logger.info(f"Importing data into {self.path}")
+        player_stats = source.load_player_stats()
+        self.write_player_stats(player_stats)
+
+        game_log = source.load_game_log()
+        games = game_log.get("games", [])
+        oldest_resident = games[0]["game_number"] if games else game_log.get("last_game_number", 0) + 1
+        with self._lock, self.conn:
+            for game in games:
+                self._insert_game(game)
+            for game in source.iter_archived_games(oldest_resident):
+                self._insert_game(game)
+            self._set_last_game_number(game_log.get("last_game_number", 0))
+
+        for name in ("host_whitelist", "user_profiles"):
+            data = source.load_collection(name, {})
+            if data:
+                self.save_collection(name, data)
+
+    def load_player_stats(self):
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT player_id, games_played, wins, losses, rating FROM player_stats"
+            ).fetchall()
+        return {
+            player_id: PlayerStats(games_played, wins, losses, rating)
+            for player_id, games_played, wins, losses, rating in rows
+        }
+
+    def prepare_player_stats(self, player_stats, dirty_ids):
+        return {
+            user_id: player_stats[user_id]
+            for user_id in dirty_ids
+            if user_id in player_stats
+        }
+
+    def write_player_stats(self, payload):
+        rows = [
+            (user_id, stats.games_played, stats.wins, stats.losses, stats.rating)
+            for user_id, stats in payload.items()
+        ]
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO player_stats (player_id, games_played, wins, losses, rating) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(player_id) DO UPDATE SET games_played = excluded.games_played, "
+                "wins = excluded.wins, losses = excluded.losses, rating = excluded.rating",
+                rows
+            )
+
+    def load_game_log(self):
+        game_log = empty_game_log()
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT game_number, timestamp, status, winner, end_timestamp, team1, team2 "
+                "FROM games ORDER BY game_number DESC LIMIT ?",
+                (Config.GAME_LOG_RECENT_GAMES,)
+            ).fetchall()
+            last = self.conn.execute(
+                "SELECT value FROM meta WHERE key = 'last_game_number'"
+            ).fetchone()
+
+        game_log["games"] = [self._row_to_game(row) for row in reversed(rows)]
+        game_log["last_game_number"] = int(last[0]) if last else 0
+        return game_log
+
+    def record_game_event(self, game_log, event, index=None):
+        kind = event.get("event")
+        game_number = event.get("game_number")
+        entry = apply_game_event(game_log, event, index=index)
+
+        with self._lock, self.conn:
+            if kind == GAME_ALLOCATED:
+                self._set_last_game_number(game_number)
+            elif kind == GAME_STARTED:
+                self._insert_game(event["game"])
+                self._set_last_game_number(game_number)
+            elif kind in (GAME_COMPLETED, GAME_CANCELLED):
+                self.conn.execute(
+                    "UPDATE games SET status = ?, winner = ?, end_timestamp = ? WHERE game_number = ?",
+                    (kind, event.get("winner"), event.get("end_timestamp"), game_number)
+                )
+
+        # Everything is in the database, so only a recent window stays resident
+        if len(game_log["games"]) > 2 * Config.GAME_LOG_RECENT_GAMES:
+            del game_log["games"][:-Config.GAME_LOG_RECENT_GAMES]
+
+        if entry is None and kind in (GAME_COMPLETED, GAME_CANCELLED):
+            entry = self.get_archived_game(game_number)
+        return entry
+
+    def get_archived_game(self, game_number):
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT game_number, timestamp, status, winner, end_timestamp, team1, team2 "
+                "FROM games WHERE game_number = ?",
+                (game_number,)
+            ).fetchone()
+        return self._row_to_game(row) if row else None
+
+    def iter_archived_games(self, before_number=None, since=None, until=None, page_size=200):
+        # Keyset pagination keeps the lock free between pages
+        cursor = before_number
+        while True:
+            query = (
+                "SELECT game_number, timestamp, status, winner, end_timestamp, team1, team2 "
+                "FROM games WHERE 1 = 1"
+            )
+            params = []
+            if cursor is not None:
+                query += " AND game_number < ?"
+                params.append(cursor)
+            if since is not None:
+                query += " AND timestamp >= ?"
+                params.append(since)
+            if until is not None:
+                query += " AND timestamp <= ?"
+                params.append(until)
+            query += " ORDER BY game_number DESC LIMIT ?"
+            params.append(page_size)
+
+            with self._lock:
+                rows = self.conn.execute(query, params).fetchall()
+            for row in rows:
+                yield self._row_to_game(row)
+            if len(rows) < page_size:
+                return
+            cursor = rows[-1][0]
+
+    def load_archived_player_games(self, before_number=None):
+        query = "SELECT player_id, game_number FROM game_players"
+        params = []
+        if before_number is not None:
+            query += " WHERE game_number < ?"
+            params.append(before_number)
+        query += " ORDER BY player_id, game_number"
+
+        player_games = {}
+        with self._lock:
+            for player_id, game_number in self.conn.execute(query, params):
+                numbers = player_games.get(player_id)
+                if numbers is None:
+                    numbers = player_games[player_id] = []
+                numbers.append(game_number)
+        return player_games
+
+    def load_collection(self, name, default):
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT key, value FROM collections WHERE name = ?", (name,)
+            ).fetchall()
+        if not rows:
+            return default
+        return {key: json.loads(value) for key, value in rows}
+
+    def save_collection(self, name, data, changed_keys=None):
+        keys = data.keys() if changed_keys is None else changed_keys
+        with self._lock, self.conn:
+            for key in keys:
+                if key in data:
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO collections (name, key, value) VALUES (?, ?, ?)",
+                        (name, key, json.dumps(data[key]))
+                    )
+                else:
+                    self.conn.execute(
+                        "DELETE FROM collections WHERE name = ? AND key = ?", (name, key)
+                    )
+
+    async def close(self, game_log):
+        with self._lock:
+            self.conn.close()
+
+    def _insert_game(self, game):
+        self.conn.execute(
+            "INSERT OR IGNORE INTO games (game_number, timestamp, status, winner, end_timestamp, team1, team2) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                game["game_number"], game["timestamp"], game.get("status", "started"),
+                game.get("winner"), game.get("end_timestamp"),
+                json.dumps(game.get("team1", [])), json.dumps(game.get("team2", []))
+            )
+        )
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO game_players (game_number, player_id, team) VALUES (?, ?, ?)",
+            [(game["game_number"], player["id"], 1) for player in game.get("team1", [])] +
+            [(game["game_number"], player["id"], 2) for player in game.get("team2", [])]
+        )
+
+    def _set_last_game_number(self, game_number):
+        self.conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('last_game_number', ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = MAX(CAST(value AS INTEGER), CAST(excluded.value AS INTEGER))",
+            (str(game_number),)
+        )
+
+    def _row_to_game(self, row):
+        game_number, timestamp, status, winner, end_timestamp, team1, team2 = row
+        game = {
+            "game_number": game_number,
+            "timestamp": timestamp,
+            "status": status,
+            "team1": json.loads(team1),
+            "team2": json.loads(team2),
+            "winner": winner
+        }
+        if end_timestamp:
+            game["end_timestamp"] = end_timestamp
+        return game
+
+def create_storage():
+    """Create the storage backend selected by Config.STORAGE_BACKEND"""
+    os.makedirs("data", exist_ok=True)
+    backend = Config.STORAGE_BACKEND.lower()
+    if backend == "sqlite":
+        # A fresh database is seeded from the existing JSON files
+        return SQLiteStorage(import_from=JSONStorage())
+    if backend != "json":
+        logger.warning(f"Unknown storage backend '{backend}', using json")
+    return JSONStorage()
@@ -0,0 +1,52 @@
+import time
+from collections import OrderedDict
+
+class TTLCache:
+    """Bounded mapping whose entries expire `ttl` seconds after they were set.
+
+    Entries are kept in the order they were last set, which is also their
+    expiry order, so expired entries are pruned from the front and the
+    least recently set entry is evicted once `max_entries` is reached.
+    """
+
+    def __init__(self, max_entries, ttl, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self.evictions = 0
+
+    def _prune(self, now):
+        while self._entries:
+            key, (expires_at, _) = next(iter(self._entries.items()))
+            if expires_at > now:
+                break
+            del self._entries[key]
+
+    def set(self, key, value=True):
+        now = self.clock()
+        self._prune(now)
+        self._entries[key] = (now + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key, default=None):
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= self.clock():
+            return default
+        return entry[1]
+
+    def __contains__(self, key):
+        entry = self._entries.get(key)
+        return entry is not None and entry[0] > self.clock()
+
+    def remaining(self, key):
+        """Seconds until an entry expires, 0 if it is not cached"""
+        entry = self._entries.get(key)
+        return max(0.0, entry[0] - self.clock()) if entry else 0.0
+
+    def __len__(self):
+        self._prune(self.clock())
+        return len(self._entries)
@@ -32,10 +32,60 @@ class Config:
     # Game settings
     MIN_PLAYERS = int(os.getenv("MIN_PLAYERS", "2"))  # Minimum players for a game
     MAX_PLAYERS = int(os.getenv("MAX_PLAYERS", "10"))  # Maximum players for a game
+    DRAFT_OPTIONS = int(os.getenv("DRAFT_OPTIONS", "10"))  # Balanced team splits offered per draft (rerolls cycle through them)
+    LOBBY_SPLIT_SECONDS = float(os.getenv("LOBBY_SPLIT_SECONDS", "0.2"))  # Search time when splitting a lobby bigger than MAX_PLAYERS into several games
+    TEAMMATE_HISTORY_GAMES = int(os.getenv("TEAMMATE_HISTORY_GAMES", "5"))  # Recent games per player checked for repeat teammates
+    TEAMMATE_PENALTY = float(os.getenv("TEAMMATE_PENALTY", "25"))  # Rating points charged per recent game a pair shared a team
     
     # File paths
     PLAYER_STATS_FILE = "data/player_stats.json"
     GAME_LOG_FILE = "data/game_log.json"
+    GAME_EVENT_LOG_FILE = "data/game_log.jsonl"
+    GAME_ARCHIVE_DIR = "data/game_archive"
+    HOST_WHITELIST_FILE = "data/host_whitelist.json"
+    USER_PROFILES_FILE = "data/user_profiles.json"
+    PLAYER_STATS_BINARY_FILE = "data/player_stats.bin"
+    SQLITE_DB_FILE = "data/bot.db"
+    
+    # Storage backend: "json" (files above) or "sqlite" (SQLITE_DB_FILE)
+    STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "json")
+    # Player stats format for the json backend: "json" or "binary" (PLAYER_STATS_BINARY_FILE)
+    PLAYER_STATS_FORMAT = os.getenv("PLAYER_STATS_FORMAT", "json")
+    
+    # Persistence settings
+    STATS_FLUSH_INTERVAL = float(os.getenv("STATS_FLUSH_INTERVAL", "5"))  # Seconds to batch stat updates before writing
+    GAME_LOG_COMPACT_EVENTS = int(os.getenv("GAME_LOG_COMPACT_EVENTS", "500"))  # Game events appended before folding into the snapshot
+    GAME_LOG_SEGMENT_SIZE = int(os.getenv("GAME_LOG_SEGMENT_SIZE", "1000"))  # Games per compressed archive segment
+    GAME_LOG_RECENT_GAMES = int(os.getenv("GAME_LOG_RECENT_GAMES", "200"))  # Most recent games kept in memory
+    
+    # Public leaderboard message
+    LEADERBOARD_DEBOUNCE = float(os.getenv("LEADERBOARD_DEBOUNCE", "3"))  # Seconds to wait for more changes before editing
+    LEADERBOARD_EDIT_INTERVAL = float(os.getenv("LEADERBOARD_EDIT_INTERVAL", "30"))  # Minimum seconds between edits
+    
+    # Player ratings
+    RATING_K_FACTOR = float(os.getenv("RATING_K_FACTOR", "32"))  # Maximum rating change per game
+    
+    # Find players DM fan-out
+    FANOUT_CONCURRENCY = int(os.getenv("FANOUT_CONCURRENCY", "4"))  # DMs in flight at once
+    FANOUT_RATE = float(os.getenv("FANOUT_RATE", "4"))  # Starting DMs per second, adapts to rate limits
+    FANOUT_MAX_RATE = float(os.getenv("FANOUT_MAX_RATE", "8"))  # Ceiling for the adaptive DM rate
+    FANOUT_SLOW_SEND = float(os.getenv("FANOUT_SLOW_SEND", "1.5"))  # A DM taking this many seconds counts as rate limited
+    MAX_RATELIMIT_WAIT = float(os.getenv("MAX_RATELIMIT_WAIT", "30"))  # Longer rate limits raise instead of waiting (discord.py minimum 30)
+    FANOUT_PROGRESS_INTERVAL = float(os.getenv("FANOUT_PROGRESS_INTERVAL", "3"))  # Seconds between progress updates to the requester
+    FIND_COOLDOWN = float(os.getenv("FIND_COOLDOWN", "120"))  # Seconds before the same user can start another find
+    NOTIFY_DEDUP_WINDOW = float(os.getenv("NOTIFY_DEDUP_WINDOW", "900"))  # Seconds a notified player is skipped by later finds
+    FIND_CACHE_SIZE = int(os.getenv("FIND_CACHE_SIZE", "5000"))  # Requester cooldowns remembered at most
+    NOTIFIED_CACHE_SIZE = int(os.getenv("NOTIFIED_CACHE_SIZE", "50000"))  # Recently notified players remembered at most
+    DM_CLOSED_RETRY = float(os.getenv("DM_CLOSED_RETRY", "604800"))  # Seconds before a player with DMs closed is tried again
+    MATCHMAKING_FLUSH_INTERVAL = float(os.getenv("MATCHMAKING_FLUSH_INTERVAL", "5"))  # Seconds to batch closed-DM and location preference updates before writing
+    LOCATION_MIN_TARGETS = int(os.getenv("LOCATION_MIN_TARGETS", "5"))  # Fewer location opt-ins than this falls back to the whole region
+    FIND_PLAYERS_NEEDED = int(os.getenv("FIND_PLAYERS_NEEDED", "3"))  # "I'm in" answers that end a find early
+    FIND_WAVE_SIZE = int(os.getenv("FIND_WAVE_SIZE", "10"))  # Players DMed per wave, 0 to DM everyone at once
+    FIND_WAVE_INTERVAL = float(os.getenv("FIND_WAVE_INTERVAL", "60"))  # Seconds to wait for answers before the next wave
+    FIND_RESPONSE_DEADLINE = float(os.getenv("FIND_RESPONSE_DEADLINE", "600"))  # Seconds after which a find stops sending waves
+    FIND_RATING_BAND = float(os.getenv("FIND_RATING_BAND", "50"))  # Rating gap treated as equally close; recent activity breaks ties
+    OUTBOX_TTL = float(os.getenv("OUTBOX_TTL", "900"))  # Seconds after which queued find DMs are dropped as stale
+    OUTBOX_CHECKPOINT_INTERVAL = float(os.getenv("OUTBOX_CHECKPOINT_INTERVAL", "2"))  # Seconds between outbox progress writes
     
     @classmethod
     def get_regional_roles(cls):
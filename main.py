@@ -12,6 +12,8 @@ from bot.stats import StatsManager
 from bot.matchmaking import MatchmakingManager
 from bot.profiles import ProfileManager
 from bot.admin import AdminManager
+from bot.storage import create_storage
+from bot.leaderboard import PERIOD_LABELS
 
 # Load environment variables
 load_dotenv()
@@ -38,9 +40,14 @@ class GameBot(commands.Bot):
         super().__init__(
             command_prefix='!',
             intents=intents,
-            help_command=None
+            help_command=None,
+            # Rate limits longer than this raise RateLimited instead of stalling a DM worker
+            max_ratelimit_timeout=Config.MAX_RATELIMIT_WAIT
         )
         
+        # Storage shared by all managers
+        self.storage = create_storage()
+        
         # Initialize managers
         self.menu_manager = MenuManager(self)
         self.draft_manager = DraftManager(self)
@@ -65,13 +72,32 @@ class GameBot(commands.Bot):
         self.add_view(StatsMenuView())
         self.add_view(HostSetupView())
         
+        # Buttons that route by custom id, so they survive restarts
+        from bot.matchmaking import FindJoinButton
+        from bot.drafts import LobbyGameButton
+        self.add_dynamic_items(FindJoinButton, LobbyGameButton)
+        
     async def on_ready(self):
         """Called when the bot is ready"""
         logger.info(f'{self.user} has connected to Discord!')
         logger.info(f'Bot is in {len(self.guilds)} guilds')
         
+        # Index regional role members once; member events keep it current
+        guild = self.get_guild(Config.GUILD_ID)
+        if guild:
+            self.matchmaking_manager.region_index.build(guild)
+        
+        # Finish find-player DMs interrupted by the last shutdown
+        await self.matchmaking_manager.resume_outbox()
+        
         # Send menus to designated channels
         await self.send_startup_menus()
+    
+    async def close(self):
+        """Flush pending data before disconnecting"""
+        await self.matchmaking_manager.close()
+        await self.stats_manager.close()
+        await super().close()
         
     async def send_startup_menus(self):
         """Send the main menus to configured channels"""
@@ -81,45 +107,53 @@ class GameBot(commands.Bot):
                 logger.error("Could not find configured guild")
                 return
                 
-            # Check for existing menus and only send if needed
-            drafts_channel = guild.get_channel(Config.DRAFTS_CHANNEL_ID)
-            if drafts_channel and not await self._has_bot_menu(drafts_channel):
-                await self.menu_manager.send_drafts_menu(drafts_channel)
-                logger.info("Sent drafts menu to channel")
-                
-            find_channel = guild.get_channel(Config.FIND_CHANNEL_ID)
-            if find_channel and not await self._has_bot_menu(find_channel):
-                await self.menu_manager.send_find_menu(find_channel)
-                logger.info("Sent find menu to channel")
-                
-            stats_channel = guild.get_channel(Config.STATS_CHANNEL_ID)
-            if stats_channel and not await self._has_bot_menu(stats_channel):
-                await self.menu_manager.send_stats_menu(stats_channel)
-                logger.info("Sent stats menu to channel")
-                
-            # Send host setup menu (admin only channel)
-            host_setup_channel = guild.get_channel(Config.HOST_SETUP_CHANNEL_ID)
-            if host_setup_channel and not await self._has_bot_menu(host_setup_channel):
-                await self.profile_manager.send_host_setup_menu(host_setup_channel)
-                await self.admin_manager.send_admin_panel(host_setup_channel)
-                logger.info("Sent host setup and admin panel to channel")
+            # Existing menus are edited in place so they pick up new controls
+            menus = [
+                (Config.DRAFTS_CHANNEL_ID, "drafts menu", self.menu_manager.build_drafts_menu()),
+                (Config.FIND_CHANNEL_ID, "find menu", self.menu_manager.build_find_menu()),
+                (Config.STATS_CHANNEL_ID, "stats menu", self.menu_manager.build_stats_menu()),
+                # Host setup and admin panel share the admin only channel
+                (Config.HOST_SETUP_CHANNEL_ID, "host setup menu", self.profile_manager.build_host_setup_menu()),
+                (Config.HOST_SETUP_CHANNEL_ID, "admin panel", self.admin_manager.build_admin_panel())
+            ]
+            for channel_id, name, (embed, view) in menus:
+                channel = guild.get_channel(channel_id)
+                if not channel:
+                    continue
+                message = await self._find_bot_menu(channel, embed.title)
+                if message:
+                    await message.edit(embed=embed, view=view)
+                    logger.info(f"Updated {name}")
+                else:
+                    await channel.send(embed=embed, view=view)
+                    logger.info(f"Sent {name} to channel")
                 
         except Exception as e:
             logger.error(f"Error sending startup menus: {e}")
     
-    async def _has_bot_menu(self, channel):
-        """Check if channel already has a bot menu"""
+    async def _find_bot_menu(self, channel, title):
+        """Find the bot's menu message with the given embed title in a channel"""
         try:
             async for message in channel.history(limit=20):
-                if message.author == self.user and message.embeds:
-                    return True
-            return False
+                if message.author == self.user and message.embeds and message.embeds[0].title == title:
+                    return message
+            return None
         except Exception:
-            return False
+            return None
     
     async def on_voice_state_update(self, member, before, after):
         """Handle voice state changes"""
         await self.voice_manager.handle_voice_state_update(member, before, after)
+    
+    async def on_member_update(self, before, after):
+        """Keep the region index in step with regional role changes"""
+        self.matchmaking_manager.region_index.update_member(before, after)
+    
+    async def on_member_join(self, member):
+        self.matchmaking_manager.region_index.add_member(member)
+    
+    async def on_member_remove(self, member):
+        self.matchmaking_manager.region_index.remove_member(member)
 
 # Create bot instance
 bot = GameBot()
@@ -144,42 +178,30 @@ async def stats_command(ctx, member: discord.Member = None):
         color=discord.Color.blue()
     )
     
-    embed.add_field(name="Games Played", value=stats['games_played'], inline=True)
-    embed.add_field(name="Wins", value=stats['wins'], inline=True)
-    embed.add_field(name="Losses", value=stats['losses'], inline=True)
+    embed.add_field(name="Games Played", value=stats.games_played, inline=True)
+    embed.add_field(name="Wins", value=stats.wins, inline=True)
+    embed.add_field(name="Losses", value=stats.losses, inline=True)
     
-    if stats['games_played'] > 0:
-        win_rate = (stats['wins'] / stats['games_played']) * 100
+    if stats.games_played > 0:
+        win_rate = stats.win_rate * 100
         embed.add_field(name="Win Rate", value=f"{win_rate:.1f}%", inline=True)
+        embed.add_field(name="Rating", value=f"{stats.rating:.0f}", inline=True)
+    
+    rank = bot.stats_manager.get_player_rank(member.id)
+    if rank:
+        embed.add_field(name="Rank", value=f"#{rank[0]} of {rank[1]}", inline=True)
     
     await ctx.send(embed=embed)
 
 @bot.command(name='leaderboard')
-async def leaderboard_command(ctx):
-    """Show the leaderboard"""
-    leaderboard = bot.stats_manager.get_leaderboard()
-    
-    embed = discord.Embed(
-        title="🏆 Leaderboard",
-        color=discord.Color.gold()
-    )
-    
-    if not leaderboard:
-        embed.description = "No games played yet!"
-        await ctx.send(embed=embed)
+async def leaderboard_command(ctx, period: str = "lifetime"):
+    """Show the leaderboard for lifetime, today, week, month or season"""
+    period = period.lower()
+    if period not in PERIOD_LABELS:
+        await ctx.send(f"❌ Unknown period. Use one of: {', '.join(PERIOD_LABELS)}")
         return
     
-    description = ""
-    for i, (user_id, stats) in enumerate(leaderboard[:10], 1):
-        try:
-            user = bot.get_user(user_id)
-            name = user.display_name if user else f"User {user_id}"
-            win_rate = (stats['wins'] / stats['games_played']) * 100 if stats['games_played'] > 0 else 0
-            description += f"{i}. **{name}** - {stats['wins']}W/{stats['losses']}L ({win_rate:.1f}%)\n"
-        except Exception:
-            continue
-    
-    embed.description = description
+    embed = bot.stats_manager.build_leaderboard_embed(period)
     await ctx.send(embed=embed)
 
 if __name__ == "__main__":
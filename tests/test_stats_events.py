@@ -0,0 +1,43 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from bot.event_log import GAME_STARTED
+from bot.storage import JSONStorage
+from bot.stats import StatsManager
+
+class RecordGameEventTest(unittest.TestCase):
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        os.makedirs("data")
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def test_failed_append_does_not_duplicate_started_game(self):
+        storage = JSONStorage()
+        stats_manager = StatsManager(SimpleNamespace(storage=storage, active_games={}))
+        game = {
+            "game_number": 1,
+            "timestamp": "2026-01-01T00:00:00",
+            "status": GAME_STARTED,
+            "team1": [{"id": 1, "name": "a"}],
+            "team2": [{"id": 2, "name": "b"}]
+        }
+
+        with mock.patch.object(storage.event_log, "append", side_effect=OSError("disk full")):
+            entry = stats_manager._record_game_event({"event": GAME_STARTED, "game_number": 1, "game": game})
+
+        numbers = [logged["game_number"] for logged in stats_manager.game_log["games"]]
+        self.assertEqual(numbers, [1])
+        self.assertIs(stats_manager.get_game(1), entry)
+        asyncio.run(stats_manager.close())
+
+if __name__ == "__main__":
+    unittest.main()